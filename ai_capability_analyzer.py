@@ -7,7 +7,7 @@ Purpose: 从多维度分析用户的 AI 使用能力和协作模式
 
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
-from collections import defaultdict
+from collections import Counter
 import re
 import logging
 
@@ -137,6 +137,7 @@ class AICapabilityAnalyzer:
         # 合并所有文本进行分析
         all_text = f"{readme_content} {' '.join(file_contents.values())}".lower()
         dep_text = ' '.join(dependencies).lower()
+        name_text = repo_name.lower()
         
         # 检测 AI 工具
         for tool_name, keywords in self.ai_tools.items():
@@ -155,7 +156,7 @@ class AICapabilityAnalyzer:
         
         # 检测项目类型
         for proj_type, keywords in self.ai_project_indicators.items():
-            if any(kw in all_text or kw in repo_name.lower() for kw in keywords):
+            if any(kw in all_text or kw in name_text for kw in keywords):
                 analysis.ai_usage_types.append(proj_type)
         
         # 分析 commit messages 中的 AI 痕迹
@@ -319,9 +320,7 @@ class AICapabilityAnalyzer:
         strengths = []
         
         # 基于类型分布
-        type_counts = defaultdict(int)
-        for t in types:
-            type_counts[t] += 1
+        type_counts = Counter(types)
         
         if type_counts['audio'] > 2:
             strengths.append("语音 AI 应用专家")
@@ -333,9 +332,10 @@ class AICapabilityAnalyzer:
             strengths.append("AI 产品创造者")
         
         # 基于模式分布
-        if patterns.count('ai_workflow') > 2:
+        pattern_counts = Counter(patterns)
+        if pattern_counts['ai_workflow'] > 2:
             strengths.append("AI 工作流架构师")
-        if patterns.count('prompt_engineering') > 3:
+        if pattern_counts['prompt_engineering'] > 3:
             strengths.append("提示工程专家")
         
         # 基于工具多样性
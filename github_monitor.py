@@ -6,16 +6,45 @@ Purpose: 自动化监控GitHub仓库变化，生成简历更新建议
 """
 
 import os
+import sys
+import atexit
+import queue
+import multiprocessing
 import json
 import requests
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import base64
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+import re
+import heapq
+import tarfile
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any, Set, Tuple
 import logging
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from dataclasses import dataclass, asdict, field
-from collections import defaultdict
+from collections import Counter
+from itertools import chain, islice
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+from repo_cache import RepoCache
+from rate_limiter import GitHubRateLimiter, RateLimitedSession
+from keyword_scanner import KeywordScanner
+
+# orjson 为可选依赖，未安装时回退到标准库 json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# ijson 为可选依赖，用于流式解析分页仓库列表
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 # 导入新的分析模块
 try:
@@ -25,18 +54,155 @@ try:
 except ImportError:
     DEEP_ANALYSIS_AVAILABLE = False
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('github_monitor.log'),
-        logging.StreamHandler()
-    ]
-)
+# 配置日志：请求线程只把日志放入队列，文件和控制台输出由后台线程完成
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+def _make_log_handlers() -> List[logging.Handler]:
+    handlers = [logging.FileHandler('github_monitor.log'), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(_log_formatter)
+    return handlers
+
+def _start_log_listener():
+    """在主进程中启动日志队列和后台输出线程"""
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # 入队前只格式化消息本身，时间和级别由输出端的 formatter 添加
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    
+    listener = QueueListener(log_queue, *_make_log_handlers(), respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+def _configure_worker_logging():
+    """分析子进程没有队列监听线程，改为直接写文件和控制台"""
+    root_logger = logging.getLogger()
+    # fork 出的子进程继承了主进程的 QueueHandler，不移除的话日志会写进无人读取的队列
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    for handler in _make_log_handlers():
+        root_logger.addHandler(handler)
+    root_logger.setLevel(logging.INFO)
+
+# spawn 方式启动的子进程会重新导入本模块，只在主进程中启动监听线程
+if multiprocessing.parent_process() is None:
+    _start_log_listener()
 logger = logging.getLogger(__name__)
 
-@dataclass
+# 一次查询返回100个仓库的基础信息、语言分布和README，替代逐仓库的REST请求；%s 处可插入额外字段
+REPOS_GRAPHQL_QUERY = """
+query($cursor: String, $privacy: RepositoryPrivacy) {
+  viewer {
+    repositories(first: 100, after: $cursor, privacy: $privacy,
+                 ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER],
+                 orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        nameWithOwner
+        description
+        primaryLanguage { name }
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+        stargazerCount
+        forkCount
+        createdAt
+        updatedAt
+        pushedAt
+        diskUsage
+        issues(states: OPEN) { totalCount }
+        isPrivate
+        licenseInfo { name }
+        homepageUrl
+        languages(first: 20, orderBy: {field: SIZE, direction: DESC}) {
+          edges { size node { name } }
+        }
+        readme: object(expression: "HEAD:README.md") { ... on Blob { text } }
+        readmeLower: object(expression: "HEAD:readme.md") { ... on Blob { text } }%s
+      }
+    }
+  }
+}
+"""
+
+# 需要获取内容的关键配置文件名
+KEY_FILE_PATTERNS = frozenset({
+    'package.json', 'requirements.txt', 'pyproject.toml', 'Cargo.toml',
+    'go.mod', 'pom.xml', 'build.gradle', 'Gemfile', 'composer.json',
+    'Dockerfile', 'docker-compose.yml', 'docker-compose.yaml',
+    '.env.example', 'config.json', 'config.yaml', 'config.yml',
+    'main.py', 'app.py', 'index.ts', 'index.js', 'main.go', 'main.rs'
+})
+
+# 关键文件只分析开头部分，按字节上限获取
+KEY_FILE_MAX_BYTES = 6144
+
+# 候选关键文件较多且仓库较小时，下载一次tarball比逐个请求文件更快
+TARBALL_MIN_FILES = 3
+TARBALL_MAX_REPO_KB = 2048
+
+# requirements.txt 每行开头的包名（版本约束、extras等之前的部分）
+REQUIREMENT_NAME_PATTERN = re.compile(r'^[ \t]*([A-Za-z0-9][A-Za-z0-9_.\-]*)', re.MULTILINE)
+
+# pyproject.toml 中带引号的依赖名称
+PYPROJECT_DEP_PATTERN = re.compile(r'"([a-zA-Z0-9_-]+)"')
+
+# 架构模式检测规则：(提示, 文件树中的匹配片段)，按顺序输出
+ARCHITECTURE_TREE_HINTS = [
+    ('标准源码目录结构', ('src/', '/src')),
+    ('组件化架构', ('components/',)),
+    ('API 服务架构', ('api/', 'routes/')),
+    ('包含测试用例', ('tests/', 'test/', '__tests__')),
+    ('容器化部署', ('docker',)),
+    ('CI/CD 自动化', ('.github/workflows',)),
+    ('模型层分离', ('models/',)),
+    ('工具函数封装', ('utils/', 'helpers/'))
+]
+
+# 框架检测规则：(提示, 关键文件内容中的匹配片段)
+ARCHITECTURE_DEPS_HINTS = [
+    ('React 前端框架', ('react',)),
+    ('Next.js 全栈框架', ('next',)),
+    ('FastAPI 后端框架', ('fastapi',)),
+    ('Flask 后端框架', ('flask',)),
+    ('Express.js 后端', ('express',)),
+    ('Vite 构建工具', ('vite',))
+]
+
+# 仓库数量达到该值时分析阶段改用多进程
+ANALYSIS_PROCESS_MIN_REPOS = 500
+
+# 深度模式额外获取最近20条commit，省去逐仓库的commit请求
+COMMIT_HISTORY_GRAPHQL_FIELDS = """
+        defaultBranchRef {
+          target { ... on Commit { history(first: 20) { nodes { message } } } }
+        }"""
+
+def dump_json_bytes(data: Any) -> bytes:
+    """序列化为带缩进的UTF-8 JSON字节"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def load_json(data) -> Any:
+    """解析JSON（bytes 或 str），orjson 可用时直接解析字节"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def parse_github_time(value: str) -> datetime:
+    """解析GitHub API返回的ISO 8601时间，统一为naive UTC datetime"""
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+# Python 3.10+ 的 slots 数据类省去每个实例的 __dict__，仓库数量多时内存更省
+DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**DATACLASS_OPTIONS)
 class Repository:
     """仓库信息数据类"""
     name: str
@@ -63,7 +229,7 @@ class Repository:
     commit_messages: List[str] = field(default_factory=list)
     architecture_hints: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class ProjectAnalysis:
     """项目分析结果"""
     repo: Repository
@@ -75,19 +241,41 @@ class ProjectAnalysis:
     estimated_duration: str
     key_features: List[str]
     role_suggestions: List[str]
+    # 分析时解析一次的更新时间（naive UTC），无法解析时为 None
+    updated_dt: Optional[datetime] = None
 
 class GitHubMonitor:
     """GitHub仓库监控器"""
     
-    def __init__(self, token: str, username: str):
+    def __init__(self, token: str, username: str, max_workers: int = 8,
+                 cache_path: Optional[str] = 'data/cache/github_cache.sqlite'):
         self.token = token
         self.username = username
+        # 并发请求数，过高容易触发GitHub二级限流
+        self.max_workers = max_workers
+        # 本地缓存，pushed_at 未变化的仓库直接复用上次的数据
+        self.cache = RepoCache(cache_path) if cache_path else None
         self.headers = {
             'Authorization': f'token {token}',
             'Accept': 'application/vnd.github.v3+json'
         }
         self.base_url = 'https://api.github.com'
         
+        # 复用连接池避免重复建立TCP+TLS连接，所有请求共享限流器控制并发和节奏
+        self.rate_limiter = GitHubRateLimiter(threshold=100, max_concurrent=max_workers)
+        self.session = RateLimitedSession(self.rate_limiter)
+        self.session.headers.update(self.headers)
+        retry = Retry(
+            total=6,
+            backoff_factor=0.8,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        # 在途请求数已由限流器限制为 max_workers，流式响应会在释放名额后才读完，连接池留一倍余量
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers * 2, max_retries=retry)
+        self.session.mount('https://', adapter)
+        
         # 技术栈映射
         self.tech_mapping = {
             'Python': ['AI/ML', '数据处理', '自动化', 'Web开发'],
@@ -121,12 +309,186 @@ class GitHubMonitor:
             '区块链': ['blockchain', 'crypto', 'web3', 'defi'],
             '物联网': ['iot', 'sensor', 'embedded', 'arduino']
         }
+        
+        # 关键特性识别
+        self.feature_keywords = {
+            '自动化处理': ['auto', 'automatic', 'batch', 'process'],
+            'AI集成': ['ai', 'gpt', 'claude', 'ml', 'intelligent'],
+            'Web界面': ['web', 'ui', 'interface', 'dashboard'],
+            'API接口': ['api', 'rest', 'endpoint', 'service'],
+            '数据处理': ['data', 'csv', 'json', 'database'],
+            '图像处理': ['image', 'ocr', 'cv', 'vision'],
+            '文件管理': ['file', 'folder', 'document', 'export'],
+            '实时处理': ['real-time', 'live', 'monitor', 'watch'],
+            '批量操作': ['batch', 'bulk', 'multiple', 'mass'],
+            '跨平台': ['cross-platform', 'multi-platform', 'universal']
+        }
+        
+        # 类型分类和AI检测共用的关键词去重后只需扫描一次
+        self._keyword_scanner = KeywordScanner([
+            *self.ai_keywords,
+            *(kw for kws in self.project_types.values() for kw in kws)
+        ])
+        # 关键特性只从描述和README中提取，单独扫描这部分文本
+        self._feature_scanner = KeywordScanner(
+            kw for kws in self.feature_keywords.values() for kw in kws
+        )
+        self._tree_hint_scanner = KeywordScanner(
+            pattern for _, patterns in ARCHITECTURE_TREE_HINTS for pattern in patterns
+        )
+        self._deps_hint_scanner = KeywordScanner(
+            pattern for _, patterns in ARCHITECTURE_DEPS_HINTS for pattern in patterns
+        )
+
+    def close(self):
+        """释放连接池和缓存"""
+        self.session.close()
+        if self.cache:
+            self.cache.close()
+
+    def __enter__(self):
+        return self
 
-    def get_user_repos(self, include_private: bool = True) -> List[Repository]:
-        """获取用户所有仓库"""
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def get_user_repos(self, include_private: bool = True,
+                       with_commits: bool = False) -> List[Repository]:
+        """获取用户所有仓库，with_commits 时通过GraphQL一并获取commit历史"""
         logger.info(f"获取用户 {self.username} 的仓库列表...")
         
+        # 优先用GraphQL批量获取（每100个仓库一次请求），失败时回退到REST逐仓库获取
+        repos = self._get_user_repos_graphql(include_private, with_commits)
+        if repos is not None:
+            logger.info(f"成功获取 {len(repos)} 个仓库")
+            return repos
+        
+        repo_list = self._list_user_repos(include_private)
+        total = len(repo_list)
+        bundles = [None] * total
+        
+        # 语言分布和README是纯网络I/O，按仓库并发获取
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._fetch_repo_bundle, repo_data): index
+                for index, repo_data in enumerate(repo_list)
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                bundles[futures[future]] = future.result()
+                logger.debug(f"仓库数据获取进度: {done}/{total}")
+        
+        repos = [
+            self._build_repository(repo_data, languages, readme)
+            for repo_data, (languages, readme) in zip(repo_list, bundles)
+        ]
+        
+        logger.info(f"成功获取 {len(repos)} 个仓库")
+        return repos
+
+    def _graphql(self, query: str, variables: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """执行GraphQL查询，失败返回None"""
+        try:
+            response = self.session.post(
+                f"{self.base_url}/graphql",
+                json={'query': query, 'variables': variables},
+                timeout=30
+            )
+        except requests.RequestException as e:
+            logger.warning(f"GraphQL请求失败: {e}")
+            return None
+        
+        if response.status_code != 200:
+            logger.warning(f"GraphQL请求失败: {response.status_code}")
+            return None
+        
+        result = load_json(response.content)
+        if result.get('errors'):
+            logger.warning(f"GraphQL查询错误: {result['errors']}")
+            return None
+        return result.get('data')
+
+    def _get_user_repos_graphql(self, include_private: bool = True,
+                                with_commits: bool = False) -> Optional[List[Repository]]:
+        """通过GraphQL分页获取仓库及其语言分布、README"""
         repos = []
+        missing_readme = []
+        cursor = None
+        query = REPOS_GRAPHQL_QUERY % (COMMIT_HISTORY_GRAPHQL_FIELDS if with_commits else '')
+        
+        while True:
+            data = self._graphql(query, {
+                'cursor': cursor,
+                'privacy': None if include_private else 'PUBLIC'
+            })
+            if data is None:
+                return None
+            
+            connection = data['viewer']['repositories']
+            for node in connection['nodes']:
+                repo_data, languages, readme = self._from_graphql_node(node)
+                repo = self._build_repository(repo_data, languages, readme or "")
+                if readme is None:
+                    missing_readme.append(repo)
+                if with_commits:
+                    repo.commit_messages = self._commits_from_graphql_node(node)
+                repos.append(repo)
+            
+            page_info = connection['pageInfo']
+            if not page_info['hasNextPage']:
+                break
+            cursor = page_info['endCursor']
+        
+        # GraphQL只能按固定路径读取 README.md/readme.md，其他文件名的README回退到REST接口
+        if missing_readme:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                readmes = executor.map(
+                    lambda repo: self._fetch_cached_readme(repo.full_name, repo.pushed_at),
+                    missing_readme
+                )
+                for repo, readme in zip(missing_readme, readmes):
+                    repo.readme_content = readme
+        
+        return repos
+
+    def _from_graphql_node(self, node: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, int], Optional[str]]:
+        """将GraphQL仓库节点转换为REST格式的仓库数据，未找到README时内容为None"""
+        repo_data = {
+            'name': node['name'],
+            'full_name': node['nameWithOwner'],
+            'description': node.get('description'),
+            'language': (node.get('primaryLanguage') or {}).get('name'),
+            'topics': [t['topic']['name'] for t in node['repositoryTopics']['nodes']],
+            'stargazers_count': node['stargazerCount'],
+            'forks_count': node['forkCount'],
+            'created_at': node['createdAt'],
+            'updated_at': node['updatedAt'],
+            'pushed_at': node['pushedAt'],
+            'size': node['diskUsage'] or 0,
+            'open_issues_count': node['issues']['totalCount'],
+            'private': node['isPrivate'],
+            'license': node.get('licenseInfo'),
+            'homepage': node.get('homepageUrl')
+        }
+        languages = {
+            edge['node']['name']: edge['size']
+            for edge in node['languages']['edges']
+        }
+        readme_blob = node.get('readme') or node.get('readmeLower') or {}
+        return repo_data, languages, readme_blob.get('text')
+
+    def _commits_from_graphql_node(self, node: Dict[str, Any]) -> List[str]:
+        """提取GraphQL节点中的commit messages，格式与REST接口一致"""
+        branch = node.get('defaultBranchRef') or {}
+        history = (branch.get('target') or {}).get('history') or {}
+        return [
+            commit['message'].split('\n')[0][:200]  # 只取第一行
+            for commit in history.get('nodes', [])
+            if commit.get('message')
+        ]
+
+    def _list_user_repos(self, include_private: bool = True) -> List[Dict[str, Any]]:
+        """分页获取仓库基础信息列表"""
+        repo_list = []
         page = 1
         per_page = 100
         
@@ -142,102 +504,177 @@ class GitHubMonitor:
             if include_private:
                 params['visibility'] = 'all'
             
-            response = requests.get(url, headers=self.headers, params=params)
-            if response.status_code != 200:
+            # 带上次的 ETag 发起条件请求，列表页未变化(304)时不消耗API配额，直接复用缓存的页面
+            cache_key = f"{self.username}:repos:{include_private}:{page}"
+            entry = self.cache.get_entry(cache_key) if self.cache else None
+            headers = {'If-None-Match': entry.etag} if entry and entry.etag else None
+            
+            response = self.session.get(url, params=params, headers=headers, stream=IJSON_AVAILABLE)
+            if response.status_code == 304:
+                response.close()
+                batch = entry.value
+            elif response.status_code != 200:
                 logger.error(f"获取仓库失败: {response.status_code}")
+                response.close()
                 break
-                
-            batch_repos = response.json()
-            if not batch_repos:
+            else:
+                batch = list(self._iter_json_items(response))
+                etag = response.headers.get('ETag')
+                if self.cache and batch and etag:
+                    self.cache.set(cache_key, '', batch, etag)
+            
+            repo_list.extend(batch)
+            batch_count = len(batch)
+            if not batch_count:
                 break
-                
-            for repo_data in batch_repos:
-                # 获取仓库语言分布
-                languages = self.get_repo_languages(repo_data['full_name'])
-                
-                # 获取README内容
-                readme = self.get_readme_content(repo_data['full_name'])
-                
-                repo = Repository(
-                    name=repo_data['name'],
-                    full_name=repo_data['full_name'],
-                    description=repo_data.get('description', ''),
-                    language=repo_data.get('language', ''),
-                    languages=languages,
-                    topics=repo_data.get('topics', []),
-                    stars=repo_data['stargazers_count'],
-                    forks=repo_data['forks_count'],
-                    created_at=repo_data['created_at'],
-                    updated_at=repo_data['updated_at'],
-                    pushed_at=repo_data['pushed_at'],
-                    size=repo_data['size'],
-                    open_issues=repo_data['open_issues_count'],
-                    is_private=repo_data['private'],
-                    readme_content=readme,
-                    license=repo_data.get('license', {}).get('name') if repo_data.get('license') else None,
-                    homepage=repo_data.get('homepage')
-                )
-                repos.append(repo)
             
             page += 1
-            if len(batch_repos) < per_page:
+            if batch_count < per_page:
                 break
         
-        logger.info(f"成功获取 {len(repos)} 个仓库")
-        return repos
+        return repo_list
+
+    def _iter_json_items(self, response: requests.Response):
+        """逐个产出JSON数组元素，安装ijson时边下载边解析"""
+        if not IJSON_AVAILABLE:
+            yield from load_json(response.content)
+            return
+        
+        # 由urllib3负责gzip解压，ijson直接读取原始流
+        response.raw.decode_content = True
+        with response:
+            yield from ijson.items(response.raw, 'item')
+
+    def _fetch_repo_bundle(self, repo_data: Dict[str, Any]) -> Tuple[Dict[str, int], str]:
+        """获取单个仓库的语言分布和README（优先读取缓存）"""
+        repo_full_name = repo_data['full_name']
+        pushed_at = repo_data['pushed_at']
+        
+        languages = self._cached(f"{repo_full_name}:languages", pushed_at,
+                                 lambda: self.get_repo_languages(repo_full_name))
+        return languages, self._fetch_cached_readme(repo_full_name, pushed_at)
+
+    def _fetch_cached_readme(self, repo_full_name: str, pushed_at: str) -> str:
+        """通过REST /readme 接口获取README（支持任意README文件名），优先读取缓存"""
+        readme = self._cached_conditional(
+            f"{repo_full_name}:readme", pushed_at,
+            lambda etag: self._fetch_readme(repo_full_name, etag)
+        )
+        return readme or ""
+
+    def _cached(self, key: str, pushed_at: str, fetch):
+        """缓存命中则直接返回，否则调用 fetch 并写入缓存"""
+        if self.cache is None:
+            return fetch()
+        
+        value = self.cache.get(key, pushed_at)
+        if value is None:
+            value = fetch()
+            # 空结果可能来自临时失败，不写入缓存以免在下次推送前一直缺失
+            if value:
+                self.cache.set(key, pushed_at, value)
+        return value
+
+    def _cached_conditional(self, key: str, pushed_at: str, fetch):
+        """pushed_at 变化时用缓存的 ETag 发起条件请求，304 则复用缓存内容
+
+        fetch(etag) 返回 (value, etag)，未修改时 value 为 None。
+        """
+        if self.cache is None:
+            value, _ = fetch(None)
+            return value
+        
+        value = self.cache.get(key, pushed_at)
+        if value is not None:
+            return value
+        
+        entry = self.cache.get_entry(key)
+        value, etag = fetch(entry.etag if entry else None)
+        if value is None:
+            # 304 未修改，只刷新 pushed_at
+            logger.debug(f"条件请求未修改: {key}")
+            value = entry.value
+        if value:
+            self.cache.set(key, pushed_at, value, etag)
+        return value
+
+    def _build_repository(self, repo_data: Dict[str, Any],
+                          languages: Dict[str, int], readme: str) -> Repository:
+        """根据API返回数据构建Repository"""
+        return Repository(
+            name=repo_data['name'],
+            full_name=repo_data['full_name'],
+            description=repo_data.get('description') or '',
+            language=repo_data.get('language') or '',
+            languages=languages,
+            topics=repo_data.get('topics', []),
+            stars=repo_data['stargazers_count'],
+            forks=repo_data['forks_count'],
+            created_at=repo_data['created_at'],
+            updated_at=repo_data['updated_at'],
+            pushed_at=repo_data['pushed_at'],
+            size=repo_data['size'],
+            open_issues=repo_data['open_issues_count'],
+            is_private=repo_data['private'],
+            readme_content=readme,
+            license=repo_data.get('license', {}).get('name') if repo_data.get('license') else None,
+            homepage=repo_data.get('homepage')
+        )
 
     def get_repo_languages(self, repo_full_name: str) -> Dict[str, int]:
         """获取仓库语言分布"""
         url = f"{self.base_url}/repos/{repo_full_name}/languages"
-        response = requests.get(url, headers=self.headers)
+        response = self.session.get(url)
         
         if response.status_code == 200:
-            return response.json()
+            return load_json(response.content)
         return {}
 
     def get_readme_content(self, repo_full_name: str) -> str:
         """获取README内容"""
+        content, _ = self._fetch_readme(repo_full_name)
+        return content or ""
+
+    def _fetch_readme(self, repo_full_name: str,
+                      etag: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        """获取README内容和ETag，带 etag 时发送条件请求，未修改(304)返回 (None, etag)"""
         url = f"{self.base_url}/repos/{repo_full_name}/readme"
+        headers = {'If-None-Match': etag} if etag else None
         
-        # 添加重试机制
-        max_retries = 3
-        for attempt in range(max_retries):
+        # 连接错误和5xx由会话的 Retry 策略统一重试
+        try:
+            response = self.session.get(url, headers=headers, timeout=10)
+        except requests.RequestException as e:
+            logger.error(f"获取README失败 {repo_full_name}: {e}")
+            return "", None
+        
+        if response.status_code == 304:
+            return None, etag
+        elif response.status_code == 200:
+            content = load_json(response.content)
+            new_etag = response.headers.get('ETag')
+            # GitHub API返回base64编码的内容
+            if content.get('encoding') != 'base64':
+                return "", new_etag
             try:
-                response = requests.get(url, headers=self.headers, timeout=10)
-                
-                if response.status_code == 200:
-                    content = response.json()
-                    # GitHub API返回base64编码的内容
-                    import base64
-                    try:
-                        return base64.b64decode(content['content']).decode('utf-8')
-                    except:
-                        return ""
-                elif response.status_code == 404:
-                    # 仓库没有README
-                    return ""
-                else:
-                    logger.warning(f"获取README失败 {repo_full_name}: {response.status_code}")
-                    return ""
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    logger.warning(f"获取README失败 {repo_full_name} (尝试 {attempt + 1}/{max_retries}): {e}")
-                    time.sleep(1 * (attempt + 1))  # 递增延迟
-                    continue
-                else:
-                    logger.error(f"获取README最终失败 {repo_full_name}: {e}")
-                    return ""
-        
-        return ""
+                return base64.b64decode(content['content']).decode('utf-8', errors='replace'), new_etag
+            except (KeyError, ValueError):
+                return "", new_etag
+        elif response.status_code == 404:
+            # 仓库没有README
+            return "", None
+        else:
+            logger.warning(f"获取README失败 {repo_full_name}: {response.status_code}")
+            return "", None
 
     def get_repo_tree(self, repo_full_name: str, max_files: int = 100) -> List[str]:
         """获取仓库文件树结构"""
         url = f"{self.base_url}/repos/{repo_full_name}/git/trees/HEAD?recursive=1"
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=15)
+            response = self.session.get(url, timeout=15)
             if response.status_code == 200:
-                tree_data = response.json()
+                tree_data = load_json(response.content)
                 files = []
                 for item in tree_data.get('tree', [])[:max_files]:
                     if item.get('type') == 'blob':
@@ -251,45 +688,99 @@ class GitHubMonitor:
     def get_file_content(self, repo_full_name: str, file_path: str) -> str:
         """获取指定文件内容"""
         url = f"{self.base_url}/repos/{repo_full_name}/contents/{file_path}"
+        # 直接请求原始内容并只取文件开头，避免下载大文件后再截断
+        headers = {
+            'Accept': 'application/vnd.github.raw',
+            'Range': f'bytes=0-{KEY_FILE_MAX_BYTES - 1}'
+        }
         
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            if response.status_code == 200:
-                content_data = response.json()
-                if content_data.get('encoding') == 'base64':
-                    return base64.b64decode(content_data.get('content', '')).decode('utf-8', errors='ignore')
+            response = self.session.get(url, headers=headers, timeout=10, stream=True)
+            with response:
+                if response.status_code in (200, 206):
+                    # 服务端忽略 Range 时也只读取前 KEY_FILE_MAX_BYTES 字节
+                    data = response.raw.read(KEY_FILE_MAX_BYTES, decode_content=True)
+                    return data.decode('utf-8', errors='ignore')
         except Exception as e:
             logger.debug(f"获取文件失败 {repo_full_name}/{file_path}: {e}")
         
         return ""
 
-    def get_key_files(self, repo_full_name: str, file_tree: List[str]) -> Dict[str, str]:
-        """获取关键配置文件内容"""
-        key_file_patterns = [
-            'package.json', 'requirements.txt', 'pyproject.toml', 'Cargo.toml',
-            'go.mod', 'pom.xml', 'build.gradle', 'Gemfile', 'composer.json',
-            'Dockerfile', 'docker-compose.yml', 'docker-compose.yaml',
-            '.env.example', 'config.json', 'config.yaml', 'config.yml',
-            'main.py', 'app.py', 'index.ts', 'index.js', 'main.go', 'main.rs'
-        ]
-        
+    def get_key_files(self, repo_full_name: str, file_tree: List[str],
+                      repo_size: Optional[int] = None) -> Dict[str, str]:
+        """获取关键配置文件内容，repo_size 为仓库大小(KB)，已知大小的小仓库多文件时改用tarball一次获取"""
         key_files = {}
-        files_to_fetch = []
-        
-        for file_path in file_tree:
-            filename = file_path.split('/')[-1]
-            if filename in key_file_patterns:
-                files_to_fetch.append(file_path)
+        files_to_fetch = [
+            file_path for file_path in file_tree
+            if file_path.rpartition('/')[2] in KEY_FILE_PATTERNS
+        ]
         
         # 限制获取数量避免 API 限制
-        for file_path in files_to_fetch[:8]:
-            content = self.get_file_content(repo_full_name, file_path)
+        files_to_fetch = files_to_fetch[:8]
+        if not files_to_fetch:
+            return key_files
+        
+        # GraphQL 的 diskUsage 为空时大小记为0，同样视为未知大小，不下载tarball
+        if (len(files_to_fetch) >= TARBALL_MIN_FILES and repo_size
+                and repo_size <= TARBALL_MAX_REPO_KB):
+            contents = self.get_key_files_via_tarball(repo_full_name, files_to_fetch)
+            if contents is not None:
+                for file_path in files_to_fetch:
+                    content = contents.get(file_path)
+                    if content:
+                        key_files[file_path] = content[:5000]  # 限制大小
+                return key_files
+        
+        # 各文件请求相互独立，并发获取；请求节奏由会话层的限流钩子控制
+        contents = {}
+        with ThreadPoolExecutor(max_workers=len(files_to_fetch)) as executor:
+            futures = {
+                executor.submit(self.get_file_content, repo_full_name, file_path): file_path
+                for file_path in files_to_fetch
+            }
+            for future in as_completed(futures):
+                contents[futures[future]] = future.result()
+        
+        # 按文件树顺序写入，保证依赖解析和架构检测结果稳定
+        for file_path in files_to_fetch:
+            content = contents[file_path]
             if content:
                 key_files[file_path] = content[:5000]  # 限制大小
-            time.sleep(0.1)  # 避免频繁请求
         
         return key_files
 
+    def get_key_files_via_tarball(self, repo_full_name: str,
+                                  file_paths: List[str]) -> Optional[Dict[str, str]]:
+        """流式读取仓库tarball并提取指定文件开头内容，失败返回None"""
+        url = f"{self.base_url}/repos/{repo_full_name}/tarball"
+        wanted = set(file_paths)
+        contents = {}
+        
+        try:
+            response = self.session.get(url, timeout=30, stream=True)
+            with response:
+                if response.status_code != 200:
+                    logger.debug(f"获取tarball失败 {repo_full_name}: {response.status_code}")
+                    return None
+                
+                with tarfile.open(fileobj=response.raw, mode='r|gz') as archive:
+                    for member in archive:
+                        if not member.isfile():
+                            continue
+                        # 成员路径带有 "owner-repo-sha/" 前缀
+                        path = member.name.partition('/')[2]
+                        if path not in wanted:
+                            continue
+                        data = archive.extractfile(member).read(KEY_FILE_MAX_BYTES)
+                        contents[path] = data.decode('utf-8', errors='ignore')
+                        if len(contents) == len(wanted):
+                            break
+        except (requests.RequestException, tarfile.TarError, OSError) as e:
+            logger.debug(f"读取tarball失败 {repo_full_name}: {e}")
+            return None
+        
+        return contents
+
     def parse_dependencies(self, key_files: Dict[str, str]) -> List[str]:
         """从配置文件解析依赖"""
         dependencies = []
@@ -297,7 +788,7 @@ class GitHubMonitor:
         # 解析 package.json
         if 'package.json' in key_files:
             try:
-                pkg = json.loads(key_files['package.json'])
+                pkg = load_json(key_files['package.json'])
                 dependencies.extend(pkg.get('dependencies', {}).keys())
                 dependencies.extend(pkg.get('devDependencies', {}).keys())
             except:
@@ -306,22 +797,18 @@ class GitHubMonitor:
         # 解析 requirements.txt
         for path, content in key_files.items():
             if 'requirements' in path and path.endswith('.txt'):
-                for line in content.split('\n'):
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        # 移除版本号
-                        dep = line.split('==')[0].split('>=')[0].split('<=')[0].split('[')[0]
-                        dependencies.append(dep)
+                # 每行开头的包名，自动跳过注释、空行和 -r 等选项行
+                dependencies.extend(REQUIREMENT_NAME_PATTERN.findall(content))
         
         # 解析 pyproject.toml (简化)
         if 'pyproject.toml' in key_files:
             content = key_files['pyproject.toml']
             # 简单提取依赖名称
-            import re
-            deps = re.findall(r'"([a-zA-Z0-9_-]+)"', content)
+            deps = PYPROJECT_DEP_PATTERN.findall(content)
             dependencies.extend(deps[:20])
         
-        return list(set(dependencies))
+        # 去重并保持出现顺序
+        return list(dict.fromkeys(dependencies))
 
     def get_commit_messages(self, repo_full_name: str, limit: int = 20) -> List[str]:
         """获取最近的 commit messages"""
@@ -329,9 +816,9 @@ class GitHubMonitor:
         params = {'per_page': limit}
         
         try:
-            response = requests.get(url, headers=self.headers, params=params, timeout=10)
+            response = self.session.get(url, params=params, timeout=10)
             if response.status_code == 200:
-                commits = response.json()
+                commits = load_json(response.content)
                 messages = []
                 for commit in commits:
                     msg = commit.get('commit', {}).get('message', '')
@@ -345,165 +832,139 @@ class GitHubMonitor:
 
     def detect_architecture_hints(self, file_tree: List[str], key_files: Dict[str, str]) -> List[str]:
         """从文件结构检测架构模式"""
-        hints = []
-        
-        # 检测常见架构模式
+        # 检测常见架构模式和框架，每段文本只扫描一次，按规则顺序输出
         tree_str = ' '.join(file_tree).lower()
-        
-        if 'src/' in tree_str or '/src' in tree_str:
-            hints.append('标准源码目录结构')
-        
-        if 'components/' in tree_str:
-            hints.append('组件化架构')
-        
-        if 'api/' in tree_str or 'routes/' in tree_str:
-            hints.append('API 服务架构')
-        
-        if 'tests/' in tree_str or 'test/' in tree_str or '__tests__' in tree_str:
-            hints.append('包含测试用例')
-        
-        if 'docker' in tree_str:
-            hints.append('容器化部署')
-        
-        if '.github/workflows' in tree_str:
-            hints.append('CI/CD 自动化')
-        
-        if 'models/' in tree_str:
-            hints.append('模型层分离')
-        
-        if 'utils/' in tree_str or 'helpers/' in tree_str:
-            hints.append('工具函数封装')
-        
-        # 检测框架
         deps_str = ' '.join(key_files.values()).lower()
+        tree_hits = self._tree_hint_scanner.scan(tree_str)
+        deps_hits = self._deps_hint_scanner.scan(deps_str)
         
-        if 'react' in deps_str:
-            hints.append('React 前端框架')
-        if 'next' in deps_str:
-            hints.append('Next.js 全栈框架')
-        if 'fastapi' in deps_str:
-            hints.append('FastAPI 后端框架')
-        if 'flask' in deps_str:
-            hints.append('Flask 后端框架')
-        if 'express' in deps_str:
-            hints.append('Express.js 后端')
-        if 'vite' in deps_str:
-            hints.append('Vite 构建工具')
+        hints = [
+            hint for hint, patterns in ARCHITECTURE_TREE_HINTS
+            if any(pattern in tree_hits for pattern in patterns)
+        ]
+        hints.extend(
+            hint for hint, patterns in ARCHITECTURE_DEPS_HINTS
+            if any(pattern in deps_hits for pattern in patterns)
+        )
         
         return hints[:8]
 
-    def get_user_repos_deep(self, include_private: bool = True) -> List[Repository]:
-        """获取用户所有仓库（带深度分析数据）"""
+    def get_user_repos_deep(self, include_private: bool = True,
+                            since: Optional[datetime] = None) -> List[Repository]:
+        """获取用户所有仓库（带深度分析数据），since（naive UTC）之前未推送的仓库只保留基础数据"""
         logger.info(f"获取用户 {self.username} 的仓库列表（深度分析模式）...")
         
-        repos = []
-        page = 1
-        per_page = 100
+        # 基础数据（含语言分布和README）与普通模式共用批量获取和缓存
+        repos = self.get_user_repos(include_private, with_commits=True)
+        deep_repos = [repo for repo in repos if self._pushed_since(repo, since)]
+        total = len(deep_repos)
+        if total < len(repos):
+            logger.info(f"跳过 {len(repos) - total} 个在 {since:%Y-%m-%d} 之后无推送的仓库的深度数据")
         
-        while True:
-            url = f"{self.base_url}/user/repos"
-            params = {
-                'page': page,
-                'per_page': per_page,
-                'sort': 'updated',
-                'direction': 'desc'
-            }
-            
-            if include_private:
-                params['visibility'] = 'all'
-            
-            response = requests.get(url, headers=self.headers, params=params)
-            if response.status_code != 200:
-                logger.error(f"获取仓库失败: {response.status_code}")
-                break
-                
-            batch_repos = response.json()
-            if not batch_repos:
-                break
-                
-            for repo_data in batch_repos:
-                repo_full_name = repo_data['full_name']
-                logger.info(f"深度分析: {repo_data['name']}")
-                
-                # 基础数据
-                languages = self.get_repo_languages(repo_full_name)
-                readme = self.get_readme_content(repo_full_name)
-                
-                # 深度分析数据
-                file_tree = self.get_repo_tree(repo_full_name)
-                key_files = self.get_key_files(repo_full_name, file_tree)
-                dependencies = self.parse_dependencies(key_files)
-                commit_messages = self.get_commit_messages(repo_full_name)
-                architecture_hints = self.detect_architecture_hints(file_tree, key_files)
-                
-                repo = Repository(
-                    name=repo_data['name'],
-                    full_name=repo_full_name,
-                    description=repo_data.get('description', '') or '',
-                    language=repo_data.get('language', '') or '',
-                    languages=languages,
-                    topics=repo_data.get('topics', []),
-                    stars=repo_data['stargazers_count'],
-                    forks=repo_data['forks_count'],
-                    created_at=repo_data['created_at'],
-                    updated_at=repo_data['updated_at'],
-                    pushed_at=repo_data['pushed_at'],
-                    size=repo_data['size'],
-                    open_issues=repo_data['open_issues_count'],
-                    is_private=repo_data['private'],
-                    readme_content=readme,
-                    license=repo_data.get('license', {}).get('name') if repo_data.get('license') else None,
-                    homepage=repo_data.get('homepage'),
-                    file_tree=file_tree,
-                    key_files=key_files,
-                    dependencies=dependencies,
-                    commit_messages=commit_messages,
-                    architecture_hints=architecture_hints
-                )
-                repos.append(repo)
-                
-                # 速率限制
-                time.sleep(0.2)
-            
-            page += 1
-            if len(batch_repos) < per_page:
-                break
+        # 文件树、关键文件和commit历史按仓库并发获取，并发度由线程池控制
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self._fetch_repo_deep, repo) for repo in deep_repos]
+            for done, future in enumerate(as_completed(futures), 1):
+                future.result()
+                logger.debug(f"深度分析进度: {done}/{total}")
         
         logger.info(f"成功获取 {len(repos)} 个仓库（深度分析完成）")
         return repos
 
+    def _pushed_since(self, repo: Repository, since: Optional[datetime]) -> bool:
+        """判断仓库在 since 之后是否有推送，无法判断时视为有推送"""
+        if since is None:
+            return True
+        try:
+            return parse_github_time(repo.pushed_at) >= since
+        except (AttributeError, ValueError):
+            return True
+
+    def _fetch_repo_deep(self, repo: Repository):
+        """获取单个仓库的深度分析数据并填充到repo"""
+        logger.debug(f"深度分析: {repo.name}")
+        
+        full_name = repo.full_name
+        pushed_at = repo.pushed_at
+        
+        # 文件树、关键文件和commit历史只随推送变化，按 pushed_at 缓存
+        repo.file_tree = self._cached(f"{full_name}:tree", pushed_at,
+                                      lambda: self.get_repo_tree(full_name))
+        repo.key_files = self._cached(f"{full_name}:key_files", pushed_at,
+                                      lambda: self.get_key_files(full_name, repo.file_tree, repo.size))
+        repo.dependencies = self.parse_dependencies(repo.key_files)
+        # GraphQL已返回commit历史时无需再请求
+        if not repo.commit_messages:
+            repo.commit_messages = self._cached(f"{full_name}:commits", pushed_at,
+                                                lambda: self.get_commit_messages(full_name))
+        repo.architecture_hints = self.detect_architecture_hints(repo.file_tree, repo.key_files)
+
+    def analyze_projects(self, repos: List[Repository],
+                         processes: Optional[int] = None) -> List[ProjectAnalysis]:
+        """批量分析项目，仓库较多时按CPU核数多进程并行"""
+        processes = processes or os.cpu_count() or 1
+        # 仓库较少时进程启动和序列化开销大于收益，直接串行分析
+        if processes <= 1 or len(repos) < ANALYSIS_PROCESS_MIN_REPOS:
+            return [self.analyze_project(repo) for repo in repos]
+        
+        logger.info(f"使用 {processes} 个进程分析 {len(repos)} 个项目")
+        chunksize = max(1, len(repos) // (4 * processes))
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_analysis_worker) as executor:
+            analyses = list(executor.map(_analyze_in_worker, repos, chunksize=chunksize))
+        
+        # 子进程返回的是反序列化出的新对象：换回原仓库对象避免数据重复占用内存，
+        # 小词表字符串驻留后各分析结果共用同一对象，后续汇总计数时哈希和比较更快
+        for repo, analysis in zip(repos, analyses):
+            analysis.repo = repo
+            analysis.project_type = sys.intern(analysis.project_type)
+            analysis.tech_stack = [sys.intern(tech) for tech in analysis.tech_stack]
+            analysis.role_suggestions = [sys.intern(role) for role in analysis.role_suggestions]
+        return analyses
+
     def analyze_project(self, repo: Repository) -> ProjectAnalysis:
         """分析项目特征"""
-        # 技术栈分析
-        tech_stack = []
-        for lang, bytes_count in repo.languages.items():
-            if lang in self.tech_mapping:
-                tech_stack.extend(self.tech_mapping[lang])
-        
-        # 去重并排序
-        tech_stack = list(set(tech_stack))
+        # 技术栈分析：按语言占比顺序映射，去重并保持顺序，保证报告输出稳定
+        tech_mapping = self.tech_mapping
+        tech_stack = list(dict.fromkeys(
+            tech
+            for lang in repo.languages if lang in tech_mapping
+            for tech in tech_mapping[lang]
+        ))
+        
+        # 描述和README只转小写一次，分类用的全文和特性提取用的文本都由它们拼接
+        description_lower = (repo.description or '').lower()
+        readme_lower = repo.readme_content.lower()
+        # 类型分类和AI检测共用一次关键词扫描
+        hits = self._keyword_hits(repo, description_lower, readme_lower)
+        feature_hits = self._feature_hits(repo, description_lower, readme_lower)
         
         # 项目类型识别
-        project_type = self._classify_project_type(repo)
+        project_type = self._classify_project_type(repo, hits)
         
         # AI协作检测
-        ai_collaboration = self._detect_ai_collaboration(repo)
+        ai_collaboration = self._detect_ai_collaboration(repo, hits)
         
         # 复杂度评分
         complexity_score = self._calculate_complexity(repo)
         
         # 商业价值评估
-        business_value = self._assess_business_value(repo)
+        business_value = self._assess_business_value(complexity_score, ai_collaboration)
         
         # 估算开发时长
         estimated_duration = self._estimate_duration(repo, complexity_score)
         
         # 关键特性提取
-        key_features = self._extract_key_features(repo)
+        key_features = self._extract_key_features(repo, feature_hits)
         
         # 角色建议
         role_suggestions = self._suggest_roles(repo, tech_stack, ai_collaboration)
         
+        try:
+            updated_dt = parse_github_time(repo.updated_at)
+        except (AttributeError, ValueError) as e:
+            logger.warning(f"解析时间失败 {repo.name}: {e}")
+            updated_dt = None
+        
         return ProjectAnalysis(
             repo=repo,
             tech_stack=tech_stack,
@@ -513,28 +974,61 @@ class GitHubMonitor:
             ai_collaboration=ai_collaboration,
             estimated_duration=estimated_duration,
             key_features=key_features,
-            role_suggestions=role_suggestions
+            role_suggestions=role_suggestions,
+            updated_dt=updated_dt
         )
 
-    def _classify_project_type(self, repo: Repository) -> str:
+    def _keyword_hits(self, repo: Repository, description_lower: Optional[str] = None,
+                      readme_lower: Optional[str] = None) -> Set[str]:
+        """对名称、描述、主题和README拼接后的小写文本单次扫描，返回出现过的关键词集合"""
+        if description_lower is None:
+            description_lower = (repo.description or '').lower()
+        if readme_lower is None:
+            readme_lower = repo.readme_content.lower()
+        text = ' '.join((repo.name.lower(), description_lower,
+                         *(topic.lower() for topic in repo.topics), readme_lower))
+        return self._keyword_scanner.scan(text)
+
+    def _feature_hits(self, repo: Repository, description_lower: Optional[str] = None,
+                      readme_lower: Optional[str] = None) -> Set[str]:
+        """扫描小写的描述和README，返回出现过的特性关键词集合"""
+        if description_lower is None:
+            description_lower = (repo.description or '').lower()
+        if readme_lower is None:
+            readme_lower = repo.readme_content.lower()
+        return self._feature_scanner.scan(f"{description_lower} {readme_lower}")
+
+    def _classify_project_type(self, repo: Repository, hits: Optional[Set[str]] = None) -> str:
         """项目类型分类"""
-        text_to_analyze = f"{repo.name} {repo.description} {' '.join(repo.topics)} {repo.readme_content}".lower()
+        if hits is None:
+            hits = self._keyword_hits(repo)
         
-        scores = {}
+        best_type, best_score = "其他工具", 0
         for project_type, keywords in self.project_types.items():
-            score = sum(1 for keyword in keywords if keyword in text_to_analyze)
-            if score > 0:
-                scores[project_type] = score
+            # 同分时保留先出现的类型，关键词全中也无法超过当前最高分则跳过
+            remaining = len(keywords)
+            if remaining <= best_score:
+                continue
+            
+            score = 0
+            for keyword in keywords:
+                remaining -= 1
+                if keyword in hits:
+                    score += 1
+                elif score + remaining <= best_score:
+                    break
+            
+            if score > best_score:
+                best_type, best_score = project_type, score
         
-        if scores:
-            return max(scores, key=scores.get)
-        return "其他工具"
+        return best_type
 
-    def _detect_ai_collaboration(self, repo: Repository) -> bool:
+    def _detect_ai_collaboration(self, repo: Repository, hits: Optional[Set[str]] = None) -> bool:
         """检测AI协作特征"""
-        text_to_analyze = f"{repo.name} {repo.description} {' '.join(repo.topics)} {repo.readme_content}".lower()
+        if hits is None:
+            hits = self._keyword_hits(repo)
         
-        return any(keyword in text_to_analyze for keyword in self.ai_keywords)
+        return any(keyword in hits for keyword in self.ai_keywords)
 
     def _calculate_complexity(self, repo: Repository) -> float:
         """计算项目复杂度 (0-1)"""
@@ -569,24 +1063,23 @@ class GitHubMonitor:
             score += 0.05
         
         # README长度
-        if len(repo.readme_content) > 5000:
+        readme_length = len(repo.readme_content)
+        if readme_length > 5000:
             score += 0.1
-        elif len(repo.readme_content) > 1000:
+        elif readme_length > 1000:
             score += 0.05
         
         # 主题标签
-        if len(repo.topics) > 5:
+        topic_count = len(repo.topics)
+        if topic_count > 5:
             score += 0.1
-        elif len(repo.topics) > 2:
+        elif topic_count > 2:
             score += 0.05
         
         return min(score, 1.0)
 
-    def _assess_business_value(self, repo: Repository) -> str:
+    def _assess_business_value(self, complexity: float, ai_collab: bool) -> str:
         """评估商业价值"""
-        complexity = self._calculate_complexity(repo)
-        ai_collab = self._detect_ai_collaboration(repo)
-        
         if complexity > 0.7 and ai_collab:
             return "高价值 - AI协作复杂项目"
         elif complexity > 0.5 and ai_collab:
@@ -613,28 +1106,14 @@ class GitHubMonitor:
         else:
             return "数天"
 
-    def _extract_key_features(self, repo: Repository) -> List[str]:
-        """提取关键特性"""
-        features = []
-        
-        # 从描述和README中提取
-        text = f"{repo.description} {repo.readme_content}".lower()
+    def _extract_key_features(self, repo: Repository, hits: Optional[Set[str]] = None) -> List[str]:
+        """提取关键特性，hits 为描述和README中出现的特性关键词"""
+        if hits is None:
+            hits = self._feature_hits(repo)
         
-        feature_keywords = {
-            '自动化处理': ['auto', 'automatic', 'batch', 'process'],
-            'AI集成': ['ai', 'gpt', 'claude', 'ml', 'intelligent'],
-            'Web界面': ['web', 'ui', 'interface', 'dashboard'],
-            'API接口': ['api', 'rest', 'endpoint', 'service'],
-            '数据处理': ['data', 'csv', 'json', 'database'],
-            '图像处理': ['image', 'ocr', 'cv', 'vision'],
-            '文件管理': ['file', 'folder', 'document', 'export'],
-            '实时处理': ['real-time', 'live', 'monitor', 'watch'],
-            '批量操作': ['batch', 'bulk', 'multiple', 'mass'],
-            '跨平台': ['cross-platform', 'multi-platform', 'universal']
-        }
-        
-        for feature, keywords in feature_keywords.items():
-            if any(keyword in text for keyword in keywords):
+        features = []
+        for feature, keywords in self.feature_keywords.items():
+            if any(keyword in hits for keyword in keywords):
                 features.append(feature)
         
         return features[:5]  # 最多返回5个特性
@@ -667,63 +1146,82 @@ class GitHubMonitor:
         """生成简历更新报告"""
         logger.info("生成简历更新报告...")
         
-        cutoff_date = datetime.now() - timedelta(days=days_back)
+        # GitHub返回的时间均为UTC，截止时间也按UTC计算（naive datetime）
+        cutoff_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=days_back)
         
-        # 筛选最近更新的项目
+        # 筛选最近更新的项目，同一次遍历中累计摘要、统计、技能矩阵和重点项目评分
         recent_projects = []
         updated_projects = []
+        ai_count = 0
+        private_count = 0
+        complexity_total = 0.0
+        types = Counter()
+        tech_usage = Counter()
+        skills = Counter()
+        scored_projects = []
         
         for analysis in analyses:
-            try:
-                # 处理GitHub API返回的时间格式
-                updated_at = analysis.repo.updated_at
-                if updated_at.endswith('Z'):
-                    updated_at = updated_at.replace('Z', '+00:00')
-                updated_time = datetime.fromisoformat(updated_at)
-                
-                # 移除时区信息进行比较（都转为naive datetime）
-                if updated_time.tzinfo is not None:
-                    updated_time = updated_time.replace(tzinfo=None)
-                if cutoff_date.tzinfo is not None:
-                    cutoff_date = cutoff_date.replace(tzinfo=None)
-                
-                if updated_time > cutoff_date:
-                    recent_projects.append(analysis)
-            except Exception as e:
-                logger.warning(f"解析时间失败 {analysis.repo.name}: {e}")
+            if analysis.ai_collaboration:
+                ai_count += 1
+            if analysis.repo.is_private:
+                private_count += 1
+            complexity_total += analysis.complexity_score
+            
+            types[analysis.project_type] += 1
+            tech_usage.update(analysis.tech_stack)
+            
+            skills.update(analysis.tech_stack)
+            if analysis.ai_collaboration:
+                skills['AI协作'] += 1
+            skills.update(analysis.role_suggestions)
+            
+            scored_projects.append((self._featured_score(analysis), analysis))
+            
+            updated_time = analysis.updated_dt
+            if updated_time is None:
                 continue
             
+            if updated_time > cutoff_date:
+                recent_projects.append(analysis)
+            
             # 检查是否有显著更新
             if self._is_significant_update(analysis):
                 updated_projects.append(analysis)
         
         # 项目统计
-        stats = self._generate_project_stats(analyses)
+        stats = {
+            'project_types': dict(types),
+            'tech_stack_usage': dict(tech_usage.most_common())
+        }
         
         # 技能矩阵
-        skill_matrix = self._generate_skill_matrix(analyses)
+        skill_matrix = dict(skills.most_common())
         
         # 重点项目推荐
-        featured_projects = self._select_featured_projects(analyses)
+        featured_projects = self._select_featured_projects(scored_projects)
         
         # 生成更新建议
         update_suggestions = self._generate_update_suggestions(recent_projects, updated_projects)
         
+        # 数值汇总只计算一次，摘要和优化建议共用
+        total_count = len(analyses)
+        summary = {
+            'total_repos': total_count,
+            'recent_updates': len(recent_projects),
+            'significant_updates': len(updated_projects),
+            'ai_projects': ai_count,
+            'avg_complexity': complexity_total / total_count if total_count else 0.0
+        }
+        
         report = {
             'generated_at': datetime.now().isoformat(),
-            'summary': {
-                'total_repos': len(analyses),
-                'recent_updates': len(recent_projects),
-                'significant_updates': len(updated_projects),
-                'ai_projects': len([a for a in analyses if a.ai_collaboration]),
-                'avg_complexity': sum(a.complexity_score for a in analyses) / len(analyses)
-            },
+            'summary': summary,
             'project_stats': stats,
             'skill_matrix': skill_matrix,
             'featured_projects': [self._format_project_for_report(p) for p in featured_projects],
             'recent_updates': [self._format_project_for_report(p) for p in recent_projects],
             'update_suggestions': update_suggestions,
-            'recommendations': self._generate_recommendations(analyses)
+            'recommendations': self._generate_recommendations(summary, private_count)
         }
         
         return report
@@ -819,81 +1317,44 @@ class GitHubMonitor:
 
     def _summarize_architectures(self, repos: List[Repository]) -> Dict[str, Any]:
         """汇总架构信息"""
-        all_hints = []
-        for repo in repos:
-            all_hints.extend(repo.architecture_hints)
-        
-        hint_counts = defaultdict(int)
-        for hint in all_hints:
-            hint_counts[hint] += 1
-        
-        sorted_hints = sorted(hint_counts.items(), key=lambda x: x[1], reverse=True)
+        # 每个仓库的提示互不重复，提示计数即包含该提示的仓库数，无需再逐个仓库统计
+        hint_counts = Counter(hint for repo in repos for hint in repo.architecture_hints)
+        top_hints = hint_counts.most_common(15)
         
         return {
-            'common_patterns': [h[0] for h in sorted_hints[:10]],
-            'pattern_distribution': dict(sorted_hints[:15]),
-            'total_with_tests': sum(1 for r in repos if '包含测试用例' in r.architecture_hints),
-            'total_containerized': sum(1 for r in repos if '容器化部署' in r.architecture_hints),
-            'total_with_cicd': sum(1 for r in repos if 'CI/CD 自动化' in r.architecture_hints)
+            'common_patterns': [h[0] for h in top_hints[:10]],
+            'pattern_distribution': dict(top_hints),
+            'total_with_tests': hint_counts['包含测试用例'],
+            'total_containerized': hint_counts['容器化部署'],
+            'total_with_cicd': hint_counts['CI/CD 自动化']
         }
 
     def _is_significant_update(self, analysis: ProjectAnalysis) -> bool:
         """判断是否为显著更新"""
         # 这里可以添加更复杂的逻辑来判断更新的重要性
+        # 条件互不依赖，按开销从低到高排列以便尽早短路
         return (
-            analysis.complexity_score > 0.5 or
             analysis.ai_collaboration or
+            analysis.complexity_score > 0.5 or
             analysis.repo.stars > 5 or
             len(analysis.key_features) > 3
         )
 
-    def _generate_project_stats(self, analyses: List[ProjectAnalysis]) -> Dict[str, Any]:
-        """生成项目统计"""
-        types = defaultdict(int)
-        tech_usage = defaultdict(int)
-        
-        for analysis in analyses:
-            types[analysis.project_type] += 1
-            for tech in analysis.tech_stack:
-                tech_usage[tech] += 1
-        
-        return {
-            'project_types': dict(types),
-            'tech_stack_usage': dict(sorted(tech_usage.items(), key=lambda x: x[1], reverse=True))
-        }
-
-    def _generate_skill_matrix(self, analyses: List[ProjectAnalysis]) -> Dict[str, int]:
-        """生成技能矩阵"""
-        skills = defaultdict(int)
-        
-        for analysis in analyses:
-            for tech in analysis.tech_stack:
-                skills[tech] += 1
-            
-            if analysis.ai_collaboration:
-                skills['AI协作'] += 1
-            
-            for role in analysis.role_suggestions:
-                skills[role] += 1
-        
-        return dict(sorted(skills.items(), key=lambda x: x[1], reverse=True))
+    def _featured_score(self, analysis: ProjectAnalysis) -> float:
+        """重点项目评分：复杂度、AI协作、社区活跃度"""
+        score = analysis.complexity_score * 0.4
+        if analysis.ai_collaboration:
+            score += 0.3
+        score += min(analysis.repo.stars / 100, 0.2)
+        score += min(analysis.repo.forks / 50, 0.1)
+        return score
 
-    def _select_featured_projects(self, analyses: List[ProjectAnalysis], limit: int = 5) -> List[ProjectAnalysis]:
+    def _select_featured_projects(self, scored_projects: List[Tuple[float, ProjectAnalysis]],
+                                  limit: int = 5) -> List[ProjectAnalysis]:
         """选择重点项目"""
-        # 按复杂度、AI协作、社区活跃度排序
-        scored_projects = []
-        
-        for analysis in analyses:
-            score = analysis.complexity_score * 0.4
-            if analysis.ai_collaboration:
-                score += 0.3
-            score += min(analysis.repo.stars / 100, 0.2)
-            score += min(analysis.repo.forks / 50, 0.1)
-            
-            scored_projects.append((score, analysis))
-        
-        scored_projects.sort(key=lambda x: x[0], reverse=True)
-        return [analysis for _, analysis in scored_projects[:limit]]
+        # 只需前几名，堆选取避免对全部项目排序；同分时与稳定排序一样保持原顺序
+        top = heapq.nlargest(limit, scored_projects, key=lambda x: x[0])
+        return [analysis for _, analysis in top]
 
     def _format_project_for_report(self, analysis: ProjectAnalysis) -> Dict[str, Any]:
         """格式化项目信息用于报告"""
@@ -921,38 +1382,39 @@ class GitHubMonitor:
         if recent_projects:
             suggestions.append(f"发现 {len(recent_projects)} 个最近更新的项目，建议更新项目展示部分")
         
-        ai_projects = [p for p in recent_projects if p.ai_collaboration]
-        if ai_projects:
-            suggestions.append(f"新增 {len(ai_projects)} 个AI协作项目，突出AI专家定位")
+        # 只需要数量，直接计数而不构建筛选列表
+        ai_count = sum(1 for p in recent_projects if p.ai_collaboration)
+        if ai_count:
+            suggestions.append(f"新增 {ai_count} 个AI协作项目，突出AI专家定位")
         
-        high_value = [p for p in recent_projects if "高价值" in p.business_value]
-        if high_value:
-            suggestions.append(f"有 {len(high_value)} 个高价值项目值得重点展示")
+        high_value_count = sum(1 for p in recent_projects if "高价值" in p.business_value)
+        if high_value_count:
+            suggestions.append(f"有 {high_value_count} 个高价值项目值得重点展示")
         
-        new_skills = set()
-        for project in recent_projects:
-            new_skills.update(project.tech_stack)
+        # 保持首次出现的顺序去重，只展示前5个
+        new_skills = list(islice(dict.fromkeys(
+            chain.from_iterable(project.tech_stack for project in recent_projects)
+        ), 5))
         
         if new_skills:
-            suggestions.append(f"新增技能标签: {', '.join(list(new_skills)[:5])}")
+            suggestions.append(f"新增技能标签: {', '.join(new_skills)}")
         
         return suggestions
 
-    def _generate_recommendations(self, analyses: List[ProjectAnalysis]) -> List[str]:
+    def _generate_recommendations(self, summary: Dict[str, Any], private_count: int) -> List[str]:
         """生成优化建议"""
         recommendations = []
         
-        ai_count = len([a for a in analyses if a.ai_collaboration])
-        total_count = len(analyses)
+        total_count = summary['total_repos']
+        if not total_count:
+            return recommendations
         
-        if ai_count / total_count > 0.6:
+        if summary['ai_projects'] / total_count > 0.6:
             recommendations.append("AI协作项目比例很高，建议突出'AI协作专家'定位")
         
-        avg_complexity = sum(a.complexity_score for a in analyses) / len(analyses)
-        if avg_complexity > 0.6:
+        if summary['avg_complexity'] > 0.6:
             recommendations.append("项目整体复杂度较高，体现了高级技术能力")
         
-        private_count = len([a for a in analyses if a.repo.is_private])
         if private_count > total_count * 0.8:
             recommendations.append("私有项目较多，考虑开源部分优秀项目提升影响力")
         
@@ -965,12 +1427,22 @@ class GitHubMonitor:
             filename = f"resume_update_report_{timestamp}.json"
         
         filepath = Path(filename)
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
+        filepath.write_bytes(dump_json_bytes(report))
         
         logger.info(f"报告已保存到: {filepath}")
         return str(filepath)
 
+# 分析子进程内复用的监控器，只用于本地分析，不发起网络请求
+_worker_monitor = None
+
+def _init_analysis_worker():
+    global _worker_monitor
+    _configure_worker_logging()
+    _worker_monitor = GitHubMonitor('', '', cache_path=None)
+
+def _analyze_in_worker(repo: Repository) -> ProjectAnalysis:
+    return _worker_monitor.analyze_project(repo)
+
 def main():
     """主函数"""
     # 从环境变量获取配置
@@ -989,11 +1461,8 @@ def main():
         repos = monitor.get_user_repos(include_private=True)
         
         # 分析所有项目
-        analyses = []
-        for repo in repos:
-            logger.info(f"分析项目: {repo.name}")
-            analysis = monitor.analyze_project(repo)
-            analyses.append(analysis)
+        logger.info(f"分析 {len(repos)} 个项目...")
+        analyses = monitor.analyze_projects(repos)
         
         # 生成报告
         report = monitor.generate_resume_report(analyses)
@@ -1019,6 +1488,8 @@ def main():
     except Exception as e:
         logger.error(f"执行失败: {e}")
         raise
+    finally:
+        monitor.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
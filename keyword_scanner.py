@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+多关键词扫描
+Author: Jim
+Purpose: 一次扫描找出文本中出现的全部关键词，供项目分类和洞察分析共用
+"""
+
+from typing import Iterable, Set
+
+# pyahocorasick 为可选依赖，安装后关键词扫描单遍完成
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class KeywordScanner:
+    """多关键词子串扫描，安装 pyahocorasick 时单遍完成"""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(dict.fromkeys(keywords))
+        self._automaton = None
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+
+    def scan(self, text: str) -> Set[str]:
+        """返回文本中出现过的关键词集合"""
+        if self._automaton is not None:
+            return {keyword for _, keyword in self._automaton.iter(text)}
+        return {keyword for keyword in self.keywords if keyword in text}
@@ -6,13 +6,96 @@ Purpose: 从项目轨迹中提炼个人哲学、价值观和思维模式
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
-from collections import defaultdict
+from typing import Dict, List, Optional, Any, Tuple
+from collections import Counter
+from functools import lru_cache
+from operator import attrgetter
 from datetime import datetime
 import logging
 
+from keyword_scanner import KeywordScanner
+
 logger = logging.getLogger(__name__)
 
+# 判断项目是否以用户为导向的特性关键词
+USER_ORIENTED_KEYWORDS = ('用户', 'ui', '界面', 'web', 'user')
+
+# 价值观映射
+VALUE_INDICATORS = {
+    '效率的追求': ['automation', 'batch', 'quick', 'fast', 'efficient', 'auto'],
+    '极致的用户体验': ['ui', 'ux', 'interface', 'user', 'experience', 'design'],
+    '系统化思维': ['system', 'architecture', 'structure', 'framework', 'organize'],
+    '持续学习与迭代': ['learn', 'improve', 'update', 'version', 'iteration'],
+    '解决实际问题': ['solve', 'fix', 'tool', 'utility', 'helper', 'process'],
+    '开源共享精神': ['open', 'share', 'community', 'public', 'free'],
+    '技术与商业的平衡': ['business', 'value', 'enterprise', 'professional'],
+    '创新与探索': ['new', 'experiment', 'explore', 'innovative', 'novel'],
+}
+
+# 思维模式映射
+THINKING_PATTERNS = {
+    '问题拆解者': ['parse', 'extract', 'split', 'separate', 'decompose'],
+    '流程优化者': ['workflow', 'process', 'pipeline', 'automation', 'streamline'],
+    '工具创造者': ['tool', 'utility', 'generator', 'converter', 'builder'],
+    '系统整合者': ['integrate', 'combine', 'merge', 'connect', 'sync'],
+    '数据驱动者': ['data', 'analysis', 'statistics', 'metrics', 'report'],
+    '用户同理者': ['user', 'experience', 'interface', 'accessibility', 'friendly'],
+}
+
+# 项目类型与思维关联
+TYPE_PHILOSOPHY = {
+    'AI工具': '相信技术增益可以放大人的能力',
+    '自动化工具': '追求将重复劳动转化为可复用的系统',
+    'Web应用': '关注用户体验与技术实现的平衡',
+    '数据处理': '相信数据中蕴含着可挖掘的价值',
+    '企业系统': '理解商业价值与技术方案的关联',
+    '开发工具': '为创造者创造工具，形成价值链',
+}
+
+# 哲学宣言规则：(需要的核心价值观, 需要的思维模式, 宣言)，按顺序取第一条满足的
+PHILOSOPHY_STATEMENT_RULES = [
+    (frozenset({'效率的追求'}), frozenset({'工具创造者'}),
+     "用代码自动化重复，用工具放大创造力，让技术成为人的延伸而非束缚。"),
+    (frozenset({'极致的用户体验'}), frozenset(),
+     "技术的终极使命是服务于人，让复杂变得简单，让困难变得可能。"),
+    (frozenset({'系统化思维'}), frozenset(),
+     "以系统的眼光看待问题，以工程的方法解决问题，以创造的心态面对世界。"),
+    (frozenset({'持续学习与迭代'}), frozenset(),
+     "在不断的学习与迭代中成长，相信每一次优化都是向更好的接近。"),
+]
+
+DEFAULT_PHILOSOPHY_STATEMENT = "在技术与创造的交汇处，寻找解决问题的最优路径，让想法成为现实。"
+
+# 以下结构在导入时构建一次，所有生成器实例共用
+# 价值观和思维模式关键词合并后每个项目只扫描一次
+_KEYWORD_SCANNER = KeywordScanner([
+    *(kw for kws in VALUE_INDICATORS.values() for kw in kws),
+    *(kw for kws in THINKING_PATTERNS.values() for kw in kws)
+])
+
+# 命中集合与各类别关键词集合求交即可判断类别，不再逐个关键词查找
+_VALUE_KEYWORD_SETS = {
+    value: frozenset(keywords) for value, keywords in VALUE_INDICATORS.items()
+}
+_PATTERN_KEYWORD_SETS = {
+    pattern: frozenset(keywords) for pattern, keywords in THINKING_PATTERNS.items()
+}
+
+
+@lru_cache(maxsize=4096)
+def _match_keywords(text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """匹配文本命中的价值观和思维模式，相同文本直接复用上次的结果"""
+    hits = _KEYWORD_SCANNER.scan(text)
+    values = tuple(
+        value for value, keywords in _VALUE_KEYWORD_SETS.items()
+        if not keywords.isdisjoint(hits)
+    )
+    patterns = tuple(
+        pattern for pattern, keywords in _PATTERN_KEYWORD_SETS.items()
+        if not keywords.isdisjoint(hits)
+    )
+    return values, patterns
+
 
 @dataclass
 class PersonalPhilosophy:
@@ -59,65 +142,34 @@ class ProjectPhilosophyData:
     business_value: str
     languages: List[str]
     description: str = ""
+    # 构造时预先拼接好的小写文本，分析时不再重复拼接
+    text_blob: str = field(init=False, repr=False)
+    features_lower: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        features = ' '.join(self.key_features)
+        self.text_blob = f"{self.name} {self.description} {features}".lower()
+        self.features_lower = features.lower()
 
 
 class PhilosophicalInsightGenerator:
     """哲学洞察生成器 - 从代码中提炼人生哲学"""
     
     def __init__(self):
-        # 价值观映射
-        self.value_indicators = {
-            '效率的追求': ['automation', 'batch', 'quick', 'fast', 'efficient', 'auto'],
-            '极致的用户体验': ['ui', 'ux', 'interface', 'user', 'experience', 'design'],
-            '系统化思维': ['system', 'architecture', 'structure', 'framework', 'organize'],
-            '持续学习与迭代': ['learn', 'improve', 'update', 'version', 'iteration'],
-            '解决实际问题': ['solve', 'fix', 'tool', 'utility', 'helper', 'process'],
-            '开源共享精神': ['open', 'share', 'community', 'public', 'free'],
-            '技术与商业的平衡': ['business', 'value', 'enterprise', 'professional'],
-            '创新与探索': ['new', 'experiment', 'explore', 'innovative', 'novel'],
-        }
-        
-        # 思维模式映射
-        self.thinking_patterns = {
-            '问题拆解者': ['parse', 'extract', 'split', 'separate', 'decompose'],
-            '流程优化者': ['workflow', 'process', 'pipeline', 'automation', 'streamline'],
-            '工具创造者': ['tool', 'utility', 'generator', 'converter', 'builder'],
-            '系统整合者': ['integrate', 'combine', 'merge', 'connect', 'sync'],
-            '数据驱动者': ['data', 'analysis', 'statistics', 'metrics', 'report'],
-            '用户同理者': ['user', 'experience', 'interface', 'accessibility', 'friendly'],
-        }
-        
-        # 项目类型与思维关联
-        self.type_philosophy = {
-            'AI工具': '相信技术增益可以放大人的能力',
-            '自动化工具': '追求将重复劳动转化为可复用的系统',
-            'Web应用': '关注用户体验与技术实现的平衡',
-            '数据处理': '相信数据中蕴含着可挖掘的价值',
-            '企业系统': '理解商业价值与技术方案的关联',
-            '开发工具': '为创造者创造工具，形成价值链',
-        }
+        self.value_indicators = VALUE_INDICATORS
+        self.thinking_patterns = THINKING_PATTERNS
+        self.type_philosophy = TYPE_PHILOSOPHY
 
     def analyze_project_philosophy(self, project: ProjectPhilosophyData) -> Dict[str, Any]:
         """分析单个项目的哲学内涵"""
         
-        text = f"{project.name} {project.description} {' '.join(project.key_features)}".lower()
-        
-        # 检测价值观
-        detected_values = []
-        for value, keywords in self.value_indicators.items():
-            if any(kw in text for kw in keywords):
-                detected_values.append(value)
-        
-        # 检测思维模式
-        detected_patterns = []
-        for pattern, keywords in self.thinking_patterns.items():
-            if any(kw in text for kw in keywords):
-                detected_patterns.append(pattern)
+        # 检测价值观和思维模式
+        detected_values, detected_patterns = _match_keywords(project.text_blob)
         
         return {
             'name': project.name,
-            'values': detected_values,
-            'patterns': detected_patterns,
+            'values': list(detected_values),
+            'patterns': list(detected_patterns),
             'type_philosophy': self.type_philosophy.get(project.project_type, ''),
             'complexity': project.complexity_score,
             'ai_involved': project.ai_collaboration,
@@ -129,36 +181,32 @@ class PhilosophicalInsightGenerator:
         
         philosophy = PersonalPhilosophy()
         
-        # 分析所有项目
+        # 分析所有项目，同一次遍历中累计AI项目数和复杂度总和，供各叙事共用
         all_values = []
         all_patterns = []
         project_analyses = []
+        ai_count = 0
+        complexity_total = 0.0
         
         for project in projects:
             analysis = self.analyze_project_philosophy(project)
             project_analyses.append(analysis)
             all_values.extend(analysis['values'])
             all_patterns.extend(analysis['patterns'])
+            if project.ai_collaboration:
+                ai_count += 1
+            complexity_total += project.complexity_score
         
-        # 统计价值观频率
-        value_counts = defaultdict(int)
-        for v in all_values:
-            value_counts[v] += 1
-        
-        # 取前5个核心价值观
-        sorted_values = sorted(value_counts.items(), key=lambda x: x[1], reverse=True)
-        philosophy.core_values = [v[0] for v in sorted_values[:5]]
+        # 统计价值观频率，取前5个核心价值观
+        philosophy.core_values = [v for v, _ in Counter(all_values).most_common(5)]
         
         # 统计思维模式频率
-        pattern_counts = defaultdict(int)
-        for p in all_patterns:
-            pattern_counts[p] += 1
-        
-        sorted_patterns = sorted(pattern_counts.items(), key=lambda x: x[1], reverse=True)
-        philosophy.thinking_patterns = [p[0] for p in sorted_patterns[:4]]
+        philosophy.thinking_patterns = [p for p, _ in Counter(all_patterns).most_common(4)]
         
         # 生成成长叙事
-        philosophy.growth_narrative = self._generate_growth_narrative(projects, project_analyses)
+        philosophy.growth_narrative = self._generate_growth_narrative(
+            projects, project_analyses, ai_count, complexity_total
+        )
         philosophy.growth_stages = self._identify_growth_stages(projects)
         
         # 生成问题解决哲学
@@ -173,26 +221,25 @@ class PhilosophicalInsightGenerator:
         philosophy.creator_mindset = self._generate_creator_mindset(projects, project_analyses)
         
         # 生成 AI 协作观
-        ai_projects = [p for p in projects if p.ai_collaboration]
-        philosophy.ai_collaboration_view = self._generate_ai_view(ai_projects, len(projects))
+        philosophy.ai_collaboration_view = self._generate_ai_view(ai_count, len(projects))
         
         # 生成哲学宣言
         philosophy.philosophy_statement = self._generate_philosophy_statement(philosophy)
         
         # 生成深层洞察
-        philosophy.deep_insights = self._generate_deep_insights(philosophy, projects)
+        philosophy.deep_insights = self._generate_deep_insights(philosophy, projects, ai_count)
         
         return philosophy
 
     def _generate_growth_narrative(self, projects: List[ProjectPhilosophyData], 
-                                   analyses: List[Dict]) -> str:
+                                   analyses: List[Dict], ai_count: int,
+                                   complexity_total: float) -> str:
         """生成成长叙事"""
         
         total = len(projects)
-        ai_count = sum(1 for p in projects if p.ai_collaboration)
         ai_ratio = ai_count / total if total > 0 else 0
         
-        avg_complexity = sum(p.complexity_score for p in projects) / total if total > 0 else 0
+        avg_complexity = complexity_total / total if total > 0 else 0
         
         narratives = []
         
@@ -219,8 +266,8 @@ class PhilosophicalInsightGenerator:
         
         # 按时间排序项目
         try:
-            sorted_projects = sorted(projects, key=lambda p: p.created_at)
-        except:
+            sorted_projects = sorted(projects, key=attrgetter('created_at'))
+        except TypeError:
             sorted_projects = projects
         
         # 简化的阶段划分
@@ -230,20 +277,26 @@ class PhilosophicalInsightGenerator:
         
         # 早期阶段
         early = sorted_projects[:max(1, total // 3)]
-        early_types = set(p.project_type for p in early)
+        # 按出现顺序去重，只需前两个类型，凑满即停止遍历
+        early_types = []
+        for p in early:
+            if p.project_type not in early_types:
+                early_types.append(p.project_type)
+                if len(early_types) == 2:
+                    break
         stages.append({
             'stage': '探索期',
-            'description': f"初步涉猎 {', '.join(list(early_types)[:2])} 等领域",
+            'description': f"初步涉猎 {', '.join(early_types)} 等领域",
             'insight': '建立技术基础，积累项目经验'
         })
         
         # 中期阶段
         if total > 3:
             mid = sorted_projects[total // 3: 2 * total // 3]
-            mid_ai = sum(1 for p in mid if p.ai_collaboration)
+            mid_ai = any(p.ai_collaboration for p in mid)
             stages.append({
                 'stage': '深耕期',
-                'description': f"项目复杂度提升，{'开始探索 AI 协作' if mid_ai > 0 else '深化技术实践'}",
+                'description': f"项目复杂度提升，{'开始探索 AI 协作' if mid_ai else '深化技术实践'}",
                 'insight': '形成技术方法论，提升问题解决能力'
             })
         
@@ -287,8 +340,7 @@ class PhilosophicalInsightGenerator:
         
         # 分析项目中的用户导向
         user_oriented = sum(1 for p in projects 
-                           if any(f in str(p.key_features).lower() 
-                                 for f in ['用户', 'ui', '界面', 'web', 'user']))
+                           if any(f in p.features_lower for f in USER_ORIENTED_KEYWORDS))
         
         total = len(projects)
         user_ratio = user_oriented / total if total > 0 else 0
@@ -314,11 +366,10 @@ class PhilosophicalInsightGenerator:
         else:
             return "在解决实际问题的过程中，逐渐形成了将想法转化为可用产品的能力。创造的价值在于解决真实的需求。"
 
-    def _generate_ai_view(self, ai_projects: List[ProjectPhilosophyData], 
-                          total_count: int) -> str:
+    def _generate_ai_view(self, ai_count: int, total_count: int) -> str:
         """生成 AI 协作观"""
         
-        ai_ratio = len(ai_projects) / total_count if total_count > 0 else 0
+        ai_ratio = ai_count / total_count if total_count > 0 else 0
         
         if ai_ratio > 0.6:
             return "AI 不是替代人的威胁，而是增强人的工具。与 AI 的深度协作让创造力得以放大，让想法更快地转化为现实。这是一种新的创作范式：人提供方向与判断，AI 提供执行与可能性。"
@@ -330,30 +381,24 @@ class PhilosophicalInsightGenerator:
     def _generate_philosophy_statement(self, philosophy: PersonalPhilosophy) -> str:
         """生成一句话哲学宣言"""
         
-        # 基于核心价值观和思维模式生成
-        if '效率的追求' in philosophy.core_values and '工具创造者' in philosophy.thinking_patterns:
-            return "用代码自动化重复，用工具放大创造力，让技术成为人的延伸而非束缚。"
-        
-        if '极致的用户体验' in philosophy.core_values:
-            return "技术的终极使命是服务于人，让复杂变得简单，让困难变得可能。"
-        
-        if '系统化思维' in philosophy.core_values:
-            return "以系统的眼光看待问题，以工程的方法解决问题，以创造的心态面对世界。"
-        
-        if '持续学习与迭代' in philosophy.core_values:
-            return "在不断的学习与迭代中成长，相信每一次优化都是向更好的接近。"
+        # 基于核心价值观和思维模式，按规则顺序取第一条满足的宣言
+        core_values = set(philosophy.core_values)
+        thinking_patterns = set(philosophy.thinking_patterns)
+        for values, patterns, statement in PHILOSOPHY_STATEMENT_RULES:
+            if values <= core_values and patterns <= thinking_patterns:
+                return statement
         
         # 默认宣言
-        return "在技术与创造的交汇处，寻找解决问题的最优路径，让想法成为现实。"
+        return DEFAULT_PHILOSOPHY_STATEMENT
 
     def _generate_deep_insights(self, philosophy: PersonalPhilosophy,
-                                projects: List[ProjectPhilosophyData]) -> List[str]:
+                                projects: List[ProjectPhilosophyData],
+                                ai_count: int) -> List[str]:
         """生成深层洞察"""
         
         insights = []
         
         total = len(projects)
-        ai_count = sum(1 for p in projects if p.ai_collaboration)
         
         # 关于 AI 协作的洞察
         if ai_count > total * 0.5:
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+GitHub API客户端限流
+Author: Jim
+Purpose: 根据响应头中的配额信息统一控制所有请求的并发与节奏，避免触发GitHub限流
+"""
+
+import time
+import threading
+import logging
+from typing import Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+class GitHubRateLimiter:
+    """共享的限流器：限制同时在途的请求数，并按配额响应头暂停后续请求（线程安全）"""
+
+    def __init__(self, threshold: int = 100, max_concurrent: int = 8):
+        self.threshold = threshold
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        try:
+            self.wait()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._semaphore.release()
+
+    def wait(self):
+        """处于暂停期时阻塞到恢复时间"""
+        while True:
+            with self._lock:
+                delay = self._resume_at - time.time()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def pause(self, seconds: float, reason: str):
+        """暂停所有新请求指定秒数"""
+        if seconds <= 0:
+            return
+        with self._lock:
+            resume_at = time.time() + seconds
+            if resume_at <= self._resume_at:
+                return
+            self._resume_at = resume_at
+        logger.warning(f"{reason}，暂停请求 {seconds:.1f} 秒")
+
+    def record(self, response: requests.Response) -> bool:
+        """根据响应头更新限流状态，触发二级限流时返回 True"""
+        retry_after = self._header_int(response, 'Retry-After')
+        if response.status_code in (403, 429) and retry_after is not None:
+            self.pause(retry_after, f"触发二级限流 ({response.status_code})")
+            return True
+
+        remaining = self._header_int(response, 'X-RateLimit-Remaining')
+        reset = self._header_int(response, 'X-RateLimit-Reset')
+        if remaining is None or reset is None or remaining > self.threshold:
+            return False
+
+        # 配额将尽时把剩余请求均匀分摊到重置前，耗尽则等待至重置
+        wait_seconds = max(0, reset - time.time())
+        if remaining > 0:
+            wait_seconds /= remaining
+        self.pause(wait_seconds, f"API剩余配额 {remaining}")
+        return False
+
+    @staticmethod
+    def _header_int(response: requests.Response, name: str) -> Optional[int]:
+        value = response.headers.get(name)
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            return None
+
+
+class RateLimitedSession(requests.Session):
+    """所有请求都经过限流器的会话"""
+
+    def __init__(self, limiter: GitHubRateLimiter):
+        super().__init__()
+        self.limiter = limiter
+
+    def request(self, method, url, *args, **kwargs):
+        # 二级限流的请求在暂停结束后重发一次，避免静默丢失数据
+        for attempt in range(2):
+            with self.limiter:
+                response = super().request(method, url, *args, **kwargs)
+            if not self.limiter.record(response) or attempt:
+                break
+        return response
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+GitHub仓库数据本地缓存
+Author: Jim
+Purpose: 以仓库 pushed_at 为失效依据缓存API数据，跳过未变化仓库的重复请求
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+# msgpack 为可选依赖，安装后缓存内容以二进制存储，体积更小、编解码更快
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def encode_body(value: Any):
+    """序列化缓存内容，msgpack 可用时返回 bytes，否则返回 JSON 文本"""
+    if MSGPACK_AVAILABLE:
+        return msgpack.packb(value, use_bin_type=True)
+    return json.dumps(value, ensure_ascii=False)
+
+
+def decode_body(body) -> Any:
+    """反序列化缓存内容，按存储类型区分 msgpack 与 JSON，兼容旧缓存"""
+    if isinstance(body, bytes):
+        if not MSGPACK_AVAILABLE:
+            raise ValueError("缓存内容为 msgpack 格式，但未安装 msgpack")
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body)
+
+
+class CacheEntry(NamedTuple):
+    """缓存条目"""
+    pushed_at: str
+    value: Any
+    etag: Optional[str]
+
+
+class RepoCache:
+    """基于 SQLite 的仓库数据缓存（线程安全）"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, pushed_at TEXT, body TEXT, fetched_at INTEGER, etag TEXT)"
+        )
+        # 兼容旧版本缓存文件（无 etag 列）
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache)")}
+        if 'etag' not in columns:
+            self._conn.execute("ALTER TABLE cache ADD COLUMN etag TEXT")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, pushed_at: str) -> Optional[Any]:
+        """读取缓存，pushed_at 不一致视为未命中"""
+        entry = self.get_entry(key)
+        with self._lock:
+            if entry is None or entry.pushed_at != pushed_at:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return entry.value
+
+    def get_entry(self, key: str) -> Optional[CacheEntry]:
+        """读取缓存条目（不校验 pushed_at），用于带 ETag 的条件请求"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pushed_at, body, etag FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            value = decode_body(row[1])
+        except ValueError as e:
+            # 例如 msgpack 写入的缓存在未安装 msgpack 时无法读取，按未命中处理
+            logger.debug(f"缓存内容无法解析 {key}: {e}")
+            return None
+        return CacheEntry(row[0], value, row[2])
+
+    def set(self, key: str, pushed_at: str, value: Any, etag: Optional[str] = None):
+        """写入缓存"""
+        body = encode_body(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, pushed_at, body, fetched_at, etag) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, pushed_at, body, int(time.time()), etag)
+            )
+            self._conn.commit()
+
+    def clear(self) -> int:
+        """清空缓存，返回删除的条目数"""
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+        logger.info(f"缓存统计: 命中 {self.hits} 次, 未命中 {self.misses} 次")
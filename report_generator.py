@@ -5,12 +5,37 @@ Author: Jim
 Purpose: 将GitHub监控数据转换为可读的简历更新报告
 """
 
+import re
 import json
+from html import escape
 from datetime import datetime
+from collections import Counter
+from functools import lru_cache
 from typing import Dict, List, Any
 from pathlib import Path
 import os
 
+# 报告中的日期显示格式
+HEADER_DATE_FORMAT = '%Y年%m月%d日 %H:%M'
+UPDATE_DATE_FORMAT = '%m月%d日'
+
+# 简单的Markdown到纯文本转换规则，导入时编译一次
+MARKDOWN_TO_TEXT_RULES = [
+    (re.compile(r'#{1,6}\s*'), ''),  # 移除标题符号
+    (re.compile(r'\*\*(.*?)\*\*'), r'\1'),  # 移除粗体
+    (re.compile(r'\*(.*?)\*'), r'\1'),  # 移除斜体
+    (re.compile(r'\[(.*?)\]\(.*?\)'), r'\1'),  # 移除链接
+    (re.compile(r'`(.*?)`'), r'\1'),  # 移除代码标记
+]
+
+
+@lru_cache(maxsize=256)
+def _format_iso_date(value: str, fmt: str) -> str:
+    """格式化ISO 8601时间（兼容结尾的Z），同一时间在多种格式的报告中只解析一次"""
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value).strftime(fmt)
+
 class ResumeReportGenerator:
     """简历报告生成器"""
     
@@ -38,11 +63,15 @@ class ResumeReportGenerator:
         suggestions = data.get('update_suggestions', [])
         recommendations = data.get('recommendations', [])
         skill_matrix = data.get('skill_matrix', {})
+        project_stats = data.get('project_stats', {})
+        # 不依赖上游已排序，按计数取前N项（部分排序，计数相同时保持原有顺序）
+        top_skills = Counter(skill_matrix).most_common(15)
+        top_tech = Counter(project_stats.get('tech_stack_usage', {})).most_common(10)
         
         # 生成报告内容
-        report = f"""# 🚀 GitHub仓库分析与简历更新报告
+        parts = [f"""# 🚀 GitHub仓库分析与简历更新报告
 
-**生成时间**: {datetime.fromisoformat(data['generated_at']).strftime('%Y年%m月%d日 %H:%M')}
+**生成时间**: {_format_iso_date(data['generated_at'], HEADER_DATE_FORMAT)}
 
 ## 📊 项目概览
 
@@ -58,14 +87,14 @@ class ResumeReportGenerator:
 
 以下项目建议在简历中重点展示:
 
-"""
+"""]
         
         # 重点项目
         for i, project in enumerate(featured[:5], 1):
             ai_badge = " 🤖" if project['ai_collaboration'] else ""
             private_badge = " 🔒" if project['is_private'] else ""
             
-            report += f"""### {i}. {project['name']}{ai_badge}{private_badge}
+            parts.append(f"""### {i}. {project['name']}{ai_badge}{private_badge}
 
 **项目类型**: {project['project_type']}  
 **商业价值**: {project['business_value']}  
@@ -83,81 +112,79 @@ class ResumeReportGenerator:
 
 ---
 
-"""
+""")
         
         # 最近更新项目
         if recent:
-            report += f"""## 🔄 最近更新项目 ({len(recent)}个)
+            parts.append(f"""## 🔄 最近更新项目 ({len(recent)}个)
 
 以下项目近期有重要更新，建议检查是否需要更新简历内容:
 
-"""
+""")
             for project in recent[:10]:
                 ai_indicator = "🤖 " if project['ai_collaboration'] else ""
-                update_time = datetime.fromisoformat(project['last_updated'].replace('Z', '+00:00')).strftime('%m月%d日')
+                update_time = _format_iso_date(project['last_updated'], UPDATE_DATE_FORMAT)
                 
-                report += f"""**{ai_indicator}{project['name']}** - {project['project_type']}  
+                parts.append(f"""**{ai_indicator}{project['name']}** - {project['project_type']}  
 *{update_time}更新* | 复杂度: {project['complexity_score']:.1f} | {project['business_value']}
 
-"""
+""")
         
         # 技能矩阵
         if skill_matrix:
-            report += """## 💪 技能矩阵分析
+            parts.append("""## 💪 技能矩阵分析
 
 基于项目分析生成的技能使用频率统计:
 
 | 技能/能力 | 项目数量 | 权重 |
 |-----------|----------|------|
-"""
-            for skill, count in list(skill_matrix.items())[:15]:
+""")
+            for skill, count in top_skills:
                 percentage = (count / summary['total_repos']) * 100
                 bar = "█" * int(percentage / 10) + "░" * (10 - int(percentage / 10))
-                report += f"| {skill} | {count} | {bar} {percentage:.0f}% |\n"
+                parts.append(f"| {skill} | {count} | {bar} {percentage:.0f}% |\n")
         
         # 更新建议
         if suggestions:
-            report += f"""## 📝 简历更新建议
+            parts.append(f"""## 📝 简历更新建议
 
 基于最近项目活动生成的具体更新建议:
 
-"""
+""")
             for i, suggestion in enumerate(suggestions, 1):
-                report += f"{i}. **{suggestion}**\n"
+                parts.append(f"{i}. **{suggestion}**\n")
             
-            report += "\n"
+            parts.append("\n")
         
         # 优化建议
         if recommendations:
-            report += f"""## 🎯 优化建议
+            parts.append(f"""## 🎯 优化建议
 
 基于整体项目分析的简历优化建议:
 
-"""
+""")
             for i, rec in enumerate(recommendations, 1):
-                report += f"{i}. {rec}\n"
+                parts.append(f"{i}. {rec}\n")
             
-            report += "\n"
+            parts.append("\n")
         
         # 项目统计详情
-        project_stats = data.get('project_stats', {})
         if project_stats:
-            report += """## 📈 详细统计
+            parts.append("""## 📈 详细统计
 
 ### 项目类型分布
-"""
+""")
             if 'project_types' in project_stats:
                 for ptype, count in project_stats['project_types'].items():
                     percentage = (count / summary['total_repos']) * 100
-                    report += f"- **{ptype}**: {count}个 ({percentage:.1f}%)\n"
+                    parts.append(f"- **{ptype}**: {count}个 ({percentage:.1f}%)\n")
             
-            report += "\n### 技术栈使用统计\n"
-            if 'tech_stack_usage' in project_stats:
-                for tech, count in list(project_stats['tech_stack_usage'].items())[:10]:
-                    report += f"- **{tech}**: {count}个项目\n"
+            parts.append("\n### 技术栈使用统计\n")
+            for tech, count in top_tech:
+                parts.append(f"- **{tech}**: {count}个项目\n")
         
         # 行动建议
-        report += f"""
+        parts.append(f"""
 ## 🚀 下一步行动
 
 ### 立即行动
@@ -171,24 +198,29 @@ class ResumeReportGenerator:
 3. **社区影响**: 提升项目的star和fork数量
 
 ### 长期建议
-1. **技术深度**: 在{list(skill_matrix.keys())[0] if skill_matrix else 'AI协作'}领域继续深耕
+1. **技术深度**: 在{top_skills[0][0] if top_skills else 'AI协作'}领域继续深耕
 2. **商业价值**: 强化项目的实际业务价值展示
 3. **行业影响**: 建立个人技术品牌和影响力
 
 ---
 
-*本报告由GitHub仓库自动分析系统生成，数据更新时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*
-"""
+*本报告由GitHub仓库自动分析系统生成，数据更新时间: {_format_iso_date(data['generated_at'], '%Y-%m-%d %H:%M:%S')}*
+""")
         
-        return report
+        return "".join(parts)
     
     def _generate_html_report(self, data: Dict[str, Any]) -> str:
-        """生成HTML格式报告"""
-        # 这里可以实现HTML格式的报告生成
-        # 为简化示例，这里返回一个基本的HTML结构
-        markdown_content = self._generate_markdown_report(data)
+        """生成HTML格式报告，章节与Markdown报告一致，直接输出HTML结构，所有数据字段均经过转义"""
+        summary = data['summary']
+        featured = data.get('featured_projects', [])
+        recent = data.get('recent_updates', [])
+        suggestions = data.get('update_suggestions', [])
+        recommendations = data.get('recommendations', [])
+        project_stats = data.get('project_stats', {})
+        top_skills = Counter(data.get('skill_matrix', {})).most_common(15)
+        top_tech = Counter(project_stats.get('tech_stack_usage', {})).most_common(10)
         
-        html = f"""<!DOCTYPE html>
+        parts = [f"""<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
@@ -209,54 +241,154 @@ class ResumeReportGenerator:
                      border-radius: 12px; font-size: 0.8em; }}
         .private-badge {{ background: #6c757d; color: white; padding: 2px 8px; 
                           border-radius: 12px; font-size: 0.8em; }}
+        table {{ border-collapse: collapse; width: 100%; }}
+        th, td {{ border: 1px solid #e9ecef; padding: 8px 12px; text-align: left; }}
+        th {{ background: #f8f9fa; }}
     </style>
 </head>
 <body>
     <div class="header">
         <h1>🚀 GitHub仓库分析与简历更新报告</h1>
-        <p>生成时间: {datetime.fromisoformat(data['generated_at']).strftime('%Y年%m月%d日 %H:%M')}</p>
+        <p>生成时间: {_format_iso_date(data['generated_at'], HEADER_DATE_FORMAT)}</p>
     </div>
     
+    <h2>📊 项目概览</h2>
     <div class="stats">
         <div class="stat-card">
-            <div class="stat-number">{data['summary']['total_repos']}</div>
+            <div class="stat-number">{summary['total_repos']}</div>
             <div>总项目数</div>
         </div>
         <div class="stat-card">
-            <div class="stat-number">{data['summary']['recent_updates']}</div>
+            <div class="stat-number">{summary['recent_updates']}</div>
             <div>最近更新</div>
         </div>
         <div class="stat-card">
-            <div class="stat-number">{data['summary']['ai_projects']}</div>
+            <div class="stat-number">{summary['significant_updates']}</div>
+            <div>显著更新</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-number">{summary['ai_projects']}</div>
             <div>AI协作项目</div>
         </div>
         <div class="stat-card">
-            <div class="stat-number">{data['summary']['avg_complexity']:.2f}</div>
+            <div class="stat-number">{summary['avg_complexity']:.2f}</div>
             <div>平均复杂度</div>
         </div>
     </div>
     
     <div class="content">
-        <!-- 这里可以添加更多HTML内容 -->
-        <pre style="white-space: pre-wrap; font-family: inherit;">{markdown_content}</pre>
+        <h2>🌟 重点项目推荐</h2>
+        <p>以下项目建议在简历中重点展示:</p>
+"""]
+        
+        # 重点项目
+        for i, project in enumerate(featured[:5], 1):
+            ai_badge = ' <span class="ai-badge">AI协作</span>' if project['ai_collaboration'] else ""
+            private_badge = ' <span class="private-badge">私有</span>' if project['is_private'] else ""
+            features = "".join(f"<li>{escape(feature)}</li>" for feature in project['key_features'])
+            
+            parts.append(f"""        <div class="project-card">
+            <h3>{i}. {escape(project['name'])}{ai_badge}{private_badge}</h3>
+            <p><strong>项目类型</strong>: {escape(project['project_type'])}<br>
+            <strong>商业价值</strong>: {escape(project['business_value'])}<br>
+            <strong>复杂度评分</strong>: {project['complexity_score']}/1.0<br>
+            <strong>估算工期</strong>: {escape(project['estimated_duration'])}</p>
+            <p><strong>项目描述</strong>: {escape(project['description'] or '')}</p>
+            <p><strong>核心技术栈</strong>: {escape(', '.join(project['tech_stack'][:5]))}</p>
+            <p><strong>关键特性</strong>:</p>
+            <ul>{features}</ul>
+            <p><strong>建议角色</strong>: {escape(', '.join(project['role_suggestions']))}</p>
+        </div>
+""")
+        
+        # 最近更新项目
+        if recent:
+            parts.append(f"""        <h2>🔄 最近更新项目 ({len(recent)}个)</h2>
+        <p>以下项目近期有重要更新，建议检查是否需要更新简历内容:</p>
+        <ul>
+""")
+            for project in recent[:10]:
+                ai_indicator = "🤖 " if project['ai_collaboration'] else ""
+                update_time = _format_iso_date(project['last_updated'], UPDATE_DATE_FORMAT)
+                parts.append(f"            <li><strong>{ai_indicator}{escape(project['name'])}</strong> - "
+                             f"{escape(project['project_type'])}<br>"
+                             f"<em>{update_time}更新</em> | 复杂度: {project['complexity_score']:.1f} | "
+                             f"{escape(project['business_value'])}</li>\n")
+            parts.append("        </ul>\n")
+        
+        # 技能矩阵
+        if top_skills:
+            parts.append("""        <h2>💪 技能矩阵分析</h2>
+        <p>基于项目分析生成的技能使用频率统计:</p>
+        <table>
+            <tr><th>技能/能力</th><th>项目数量</th><th>权重</th></tr>
+""")
+            for skill, count in top_skills:
+                percentage = (count / summary['total_repos']) * 100
+                bar = "█" * int(percentage / 10) + "░" * (10 - int(percentage / 10))
+                parts.append(f"            <tr><td>{escape(skill)}</td><td>{count}</td>"
+                             f"<td>{bar} {percentage:.0f}%</td></tr>\n")
+            parts.append("        </table>\n")
+        
+        # 更新建议与优化建议
+        for title, intro, items in (
+            ("📝 简历更新建议", "基于最近项目活动生成的具体更新建议:", suggestions),
+            ("🎯 优化建议", "基于整体项目分析的简历优化建议:", recommendations),
+        ):
+            if items:
+                list_items = "".join(f"<li>{escape(item)}</li>" for item in items)
+                parts.append(f"        <h2>{title}</h2>\n        <p>{intro}</p>\n        <ol>{list_items}</ol>\n")
+        
+        # 项目统计详情
+        if project_stats:
+            parts.append("        <h2>📈 详细统计</h2>\n        <h3>项目类型分布</h3>\n        <ul>")
+            for ptype, count in project_stats.get('project_types', {}).items():
+                percentage = (count / summary['total_repos']) * 100
+                parts.append(f"<li><strong>{escape(ptype)}</strong>: {count}个 ({percentage:.1f}%)</li>")
+            parts.append("</ul>\n        <h3>技术栈使用统计</h3>\n        <ul>")
+            for tech, count in top_tech:
+                parts.append(f"<li><strong>{escape(tech)}</strong>: {count}个项目</li>")
+            parts.append("</ul>\n")
+        
+        # 行动建议
+        top_skill = escape(top_skills[0][0]) if top_skills else 'AI协作'
+        parts.append(f"""        <h2>🚀 下一步行动</h2>
+        <h3>立即行动</h3>
+        <ol>
+            <li><strong>更新项目展示</strong>: 重点突出前{len(featured)}个推荐项目</li>
+            <li><strong>技能标签更新</strong>: 添加高频技术栈到技能列表</li>
+            <li><strong>角色定位优化</strong>: 基于AI项目比例({summary['ai_projects']}/{summary['total_repos']})强化AI专家定位</li>
+        </ol>
+        <h3>中期规划</h3>
+        <ol>
+            <li><strong>开源贡献</strong>: 考虑开源部分优秀私有项目</li>
+            <li><strong>项目文档</strong>: 完善重点项目的README和技术文档</li>
+            <li><strong>社区影响</strong>: 提升项目的star和fork数量</li>
+        </ol>
+        <h3>长期建议</h3>
+        <ol>
+            <li><strong>技术深度</strong>: 在{top_skill}领域继续深耕</li>
+            <li><strong>商业价值</strong>: 强化项目的实际业务价值展示</li>
+            <li><strong>行业影响</strong>: 建立个人技术品牌和影响力</li>
+        </ol>
+        <hr>
+        <p><em>本报告由GitHub仓库自动分析系统生成，数据更新时间: {_format_iso_date(data['generated_at'], '%Y-%m-%d %H:%M:%S')}</em></p>
     </div>
 </body>
-</html>"""
+</html>""")
         
-        return html
+        return "".join(parts)
     
     def _generate_text_report(self, data: Dict[str, Any]) -> str:
         """生成纯文本格式报告"""
-        markdown_content = self._generate_markdown_report(data)
-        # 移除Markdown格式符号，保留纯文本
-        import re
-        
-        # 简单的Markdown到纯文本转换
-        text = re.sub(r'#{1,6}\s*', '', markdown_content)  # 移除标题符号
-        text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)  # 移除粗体
-        text = re.sub(r'\*(.*?)\*', r'\1', text)  # 移除斜体
-        text = re.sub(r'\[(.*?)\]\(.*?\)', r'\1', text)  # 移除链接
-        text = re.sub(r'`(.*?)`', r'\1', text)  # 移除代码标记
+        return self.markdown_to_text(self._generate_markdown_report(data))
+    
+    def markdown_to_text(self, markdown_content: str) -> str:
+        """将已生成的Markdown报告转换为纯文本"""
+        # 移除Markdown格式符号，保留纯文本；规则有先后依赖（粗体先于斜体），按顺序替换
+        text = markdown_content
+        for pattern, replacement in MARKDOWN_TO_TEXT_RULES:
+            text = pattern.sub(replacement, text)
         
         return text
     
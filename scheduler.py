@@ -7,19 +7,22 @@ Purpose: 定时监控GitHub仓库变化并发送通知
 
 import os
 import json
+import argparse
+import gzip
 import time
 import schedule
 import smtplib
-from datetime import datetime, timedelta
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
+import mimetypes
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
 from pathlib import Path
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 
-from github_monitor import GitHubMonitor
+from github_monitor import GitHubMonitor, dump_json_bytes
 from report_generator import ResumeReportGenerator
 
 # 配置日志
@@ -33,6 +36,15 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 调度循环单次最长睡眠时间（秒）
+MAX_IDLE_SECONDS = 3600
+
+# 每周报告配置中的星期缩写
+WEEKDAY_NAMES = {
+    'MON': 'monday', 'TUE': 'tuesday', 'WED': 'wednesday',
+    'THU': 'thursday', 'FRI': 'friday', 'SAT': 'saturday', 'SUN': 'sunday'
+}
+
 class NotificationService:
     """通知服务类"""
     
@@ -40,6 +52,51 @@ class NotificationService:
         self.config = config
         self.email_config = config.get('email', {})
         self.webhook_config = config.get('webhook', {})
+        # 复用已登录的SMTP连接，多次发送时省去重复的TCP+STARTTLS+登录
+        self._smtp: Optional[smtplib.SMTP] = None
+        # Webhook 复用连接，平台临时故障(5xx)时自动重试
+        self.session = requests.Session()
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[500, 502, 503, 504],
+            allowed_methods=frozenset(['POST']),
+            raise_on_status=False
+        )
+        self.session.mount('https://', HTTPAdapter(pool_connections=2, pool_maxsize=2, max_retries=retry))
+    
+    def _get_smtp(self, smtp_server: str, smtp_port: int,
+                  sender_email: str, sender_password: str) -> smtplib.SMTP:
+        """获取可用的SMTP连接，连接已断开时重新建立"""
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except OSError:
+                # SMTPServerDisconnected 等均为 OSError 子类
+                pass
+            self._close_smtp()
+        
+        server = smtplib.SMTP(smtp_server, smtp_port)
+        server.starttls()
+        server.login(sender_email, sender_password)
+        self._smtp = server
+        return server
+    
+    def _close_smtp(self):
+        """关闭复用的SMTP连接，连接已断开时直接释放套接字"""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except OSError:
+            self._smtp.close()
+        self._smtp = None
+    
+    def close(self):
+        """释放SMTP连接和Webhook会话"""
+        self._close_smtp()
+        self.session.close()
     
     def send_email_notification(self, subject: str, content: str, 
                               attachments: List[str] = None) -> bool:
@@ -57,49 +114,45 @@ class NotificationService:
                 return False
             
             # 创建邮件
-            msg = MIMEMultipart()
+            msg = EmailMessage()
             msg['From'] = sender_email
             msg['To'] = ', '.join(recipient_emails)
             msg['Subject'] = subject
             
             # 添加邮件正文
-            msg.attach(MIMEText(content, 'plain', 'utf-8'))
+            msg.set_content(content, charset='utf-8', cte='base64')
             
-            # 添加附件
+            # 添加附件：按扩展名设置类型，读入后立即编码，不额外保留原始字节副本；
+            # 报告为UTF-8中文，文本类附件声明 charset，避免邮件客户端按ASCII/Latin-1显示乱码
             if attachments:
                 for file_path in attachments:
-                    if Path(file_path).exists():
-                        with open(file_path, 'rb') as attachment:
-                            part = MIMEBase('application', 'octet-stream')
-                            part.set_payload(attachment.read())
-                        
-                        encoders.encode_base64(part)
-                        part.add_header(
-                            'Content-Disposition',
-                            f'attachment; filename= {Path(file_path).name}'
-                        )
-                        msg.attach(part)
+                    path = Path(file_path)
+                    if path.exists():
+                        content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+                        maintype, subtype = content_type.split('/', 1)
+                        if maintype == 'text':
+                            msg.add_attachment(path.read_text(encoding='utf-8'), subtype=subtype,
+                                               charset='utf-8', filename=path.name)
+                        else:
+                            msg.add_attachment(path.read_bytes(), maintype=maintype,
+                                               subtype=subtype, filename=path.name)
             
             # 发送邮件
-            server = smtplib.SMTP(smtp_server, smtp_port)
-            server.starttls()
-            server.login(sender_email, sender_password)
-            text = msg.as_string()
-            server.sendmail(sender_email, recipient_emails, text)
-            server.quit()
+            server = self._get_smtp(smtp_server, smtp_port, sender_email, sender_password)
+            server.send_message(msg, sender_email, recipient_emails)
             
             logger.info(f"邮件通知发送成功: {subject}")
             return True
             
         except Exception as e:
+            # 连接状态未知，关闭后下次发送时重新建立
+            self._close_smtp()
             logger.error(f"邮件发送失败: {e}")
             return False
     
     def send_webhook_notification(self, data: Dict[str, Any]) -> bool:
         """发送Webhook通知(钉钉、企业微信等)"""
         try:
-            import requests
-            
             webhook_url = self.webhook_config.get('url')
             webhook_type = self.webhook_config.get('type', 'dingtalk')
             
@@ -126,7 +179,8 @@ class NotificationService:
             else:
                 payload = data
             
-            response = requests.post(webhook_url, json=payload)
+            # 显式超时，避免Webhook服务无响应时阻塞调度器
+            response = self.session.post(webhook_url, json=payload, timeout=(3.05, 10))
             if response.status_code == 200:
                 logger.info("Webhook通知发送成功")
                 return True
@@ -142,10 +196,12 @@ class NotificationService:
         """格式化钉钉消息"""
         summary = data.get('summary', {})
         suggestions = data.get('update_suggestions', [])
+        generated_at = data.get('generated_at')
+        generated = datetime.fromisoformat(generated_at) if generated_at else datetime.now()
         
         message = f"""# 🚀 GitHub简历更新报告
 
-**生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M')}
+**生成时间**: {generated.strftime('%Y-%m-%d %H:%M')}
 
 ## 📊 项目概览
 - 总项目数: **{summary.get('total_repos', 0)}**
@@ -156,12 +212,9 @@ class NotificationService:
 ## 📝 更新建议
 """
         
-        for suggestion in suggestions[:3]:
-            message += f"- {suggestion}\n"
+        suggestion_lines = ''.join(f"- {suggestion}\n" for suggestion in suggestions[:3])
         
-        message += "\n> 详细报告请查看附件或邮件"
-        
-        return message
+        return f"{message}{suggestion_lines}\n> 详细报告请查看附件或邮件"
     
     def _format_wechat_message(self, data: Dict[str, Any]) -> str:
         """格式化企业微信消息"""
@@ -201,7 +254,9 @@ class GitHubScheduler:
             "github": {
                 "token": os.getenv('GITHUB_TOKEN', ''),
                 "username": os.getenv('GITHUB_USERNAME', 'Jim-purch'),
-                "include_private": True
+                "include_private": True,
+                "max_workers": 8,
+                "deep_analysis_days": None
             },
             "schedule": {
                 "daily_check": "09:00",
@@ -225,6 +280,7 @@ class GitHubScheduler:
             },
             "data_dir": "data",
             "report_formats": ["markdown", "html"],
+            "compress_json": False,
             "thresholds": {
                 "min_updates_for_notification": 1,
                 "min_significant_updates": 1,
@@ -250,7 +306,10 @@ class GitHubScheduler:
             logger.info("请设置环境变量 GITHUB_TOKEN 或在config.json中配置")
             return
         
-        self.monitor = GitHubMonitor(token, username)
+        max_workers = github_config.get('max_workers', 8)
+        cache_path = self.data_dir / 'cache' / 'github_cache.sqlite'
+        self.monitor = GitHubMonitor(token, username, max_workers=max_workers,
+                                     cache_path=str(cache_path))
         logger.info(f"GitHub监控器初始化成功: {username}")
     
     def run_analysis(self, force_notification: bool = False) -> Optional[Dict[str, Any]]:
@@ -261,26 +320,26 @@ class GitHubScheduler:
         
         try:
             logger.info("开始GitHub仓库分析...")
+            # 本次运行的统一时间戳，报告内容、文件名与通知共用
+            now = datetime.now()
             
             # 获取仓库列表
             include_private = self.config['github'].get('include_private', True)
             repos = self.monitor.get_user_repos(include_private)
             
             # 分析所有项目
-            analyses = []
-            for repo in repos:
-                analysis = self.monitor.analyze_project(repo)
-                analyses.append(analysis)
+            analyses = self.monitor.analyze_projects(repos)
             
             # 生成报告
             report_data = self.monitor.generate_resume_report(analyses)
+            report_data['generated_at'] = now.isoformat()
             
             # 保存报告数据
-            self._save_analysis_data(report_data)
+            saved_files, markdown = self._save_analysis_data(report_data, now=now)
             
             # 检查是否需要发送通知
             if self._should_send_notification(report_data) or force_notification:
-                self._send_notifications(report_data)
+                self._send_notifications(report_data, saved_files, markdown)
             
             logger.info("分析完成")
             return report_data
@@ -297,52 +356,68 @@ class GitHubScheduler:
         
         try:
             logger.info("开始深度GitHub仓库分析...")
+            now = datetime.now()
             
             # 获取仓库列表（深度模式）
             include_private = self.config['github'].get('include_private', True)
-            repos = self.monitor.get_user_repos_deep(include_private)
+            # 配置 deep_analysis_days 时只为该时间窗口内有推送的仓库获取深度数据
+            since = None
+            deep_days = self.config['github'].get('deep_analysis_days')
+            if deep_days:
+                since = now.astimezone(timezone.utc).replace(tzinfo=None) - timedelta(days=deep_days)
+            repos = self.monitor.get_user_repos_deep(include_private, since=since)
             
             # 分析所有项目
-            analyses = []
-            for repo in repos:
-                analysis = self.monitor.analyze_project(repo)
-                analyses.append(analysis)
+            analyses = self.monitor.analyze_projects(repos)
             
             # 生成深度报告
             report_data = self.monitor.generate_deep_report(analyses, repos)
+            report_data['generated_at'] = now.isoformat()
             
             # 保存报告数据
-            self._save_analysis_data(report_data, prefix="deep_report")
+            saved_files, markdown = self._save_analysis_data(report_data, prefix="deep_report", now=now)
             
             # 检查是否需要发送通知
             if self._should_send_notification(report_data) or force_notification:
-                self._send_notifications(report_data)
+                self._send_notifications(report_data, saved_files, markdown)
             
             logger.info("深度分析完成")
             return report_data
             
         except Exception as e:
-            logger.error(f"深度分析失败: {e}")
-            import traceback
-            traceback.print_exc()
+            # 异常堆栈随日志一起写入文件，不再单独打印到 stderr
+            logger.exception(f"深度分析失败: {e}")
             return None
     
-    def _save_analysis_data(self, report_data: Dict[str, Any], prefix: str = "report"):
-        """保存分析数据"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # 保存JSON数据
-        json_file = self.data_dir / f"{prefix}_{timestamp}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, ensure_ascii=False, indent=2)
+    def _save_analysis_data(self, report_data: Dict[str, Any], prefix: str = "report",
+                            now: Optional[datetime] = None) -> Tuple[Dict[str, str], str]:
+        """保存分析数据，返回 (各格式报告的文件路径, Markdown报告内容)"""
+        timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
+        
+        # 保存JSON数据，开启 compress_json 时以 gzip 压缩归档
+        json_bytes = dump_json_bytes(report_data)
+        if self.config.get('compress_json', False):
+            json_file = self.data_dir / f"{prefix}_{timestamp}.json.gz"
+            json_file.write_bytes(gzip.compress(json_bytes, compresslevel=6))
+        else:
+            json_file = self.data_dir / f"{prefix}_{timestamp}.json"
+            json_file.write_bytes(json_bytes)
         
-        # 生成不同格式的报告
+        # 生成不同格式的报告；Markdown只构建一次，纯文本报告和邮件正文都由它转换
+        markdown = self.report_generator.generate_report(report_data, 'markdown')
+        saved_files = {}
         for fmt in self.config.get('report_formats', ['markdown']):
-            content = self.report_generator.generate_report(report_data, fmt)
+            if fmt == 'markdown':
+                content = markdown
+            elif fmt == 'text':
+                content = self.report_generator.markdown_to_text(markdown)
+            else:
+                content = self.report_generator.generate_report(report_data, fmt)
             report_file = self.data_dir / f"{prefix}_{timestamp}.{fmt}"
-            self.report_generator.save_report(content, str(report_file), fmt)
+            saved_files[fmt] = self.report_generator.save_report(content, str(report_file), fmt)
         
         logger.info(f"报告已保存到: {self.data_dir}")
+        return saved_files, markdown
     
     def _should_send_notification(self, report_data: Dict[str, Any]) -> bool:
         """判断是否应该发送通知"""
@@ -371,24 +446,23 @@ class GitHubScheduler:
         
         return False
     
-    def _send_notifications(self, report_data: Dict[str, Any]):
-        """发送通知"""
+    def _send_notifications(self, report_data: Dict[str, Any],
+                            saved_files: Optional[Dict[str, str]] = None,
+                            markdown: Optional[str] = None):
+        """发送通知，saved_files 为本次已保存的报告文件，用作邮件附件；markdown 为已生成的Markdown报告"""
         summary = report_data.get('summary', {})
         
         # 准备邮件内容
         subject = f"GitHub简历更新报告 - {summary.get('recent_updates', 0)}个项目有更新"
         
-        # 生成邮件正文
-        email_content = self.report_generator.generate_report(report_data, 'text')
-        
-        # 准备附件
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        attachments = []
+        # 生成邮件正文（复用保存报告时已生成的Markdown）
+        if markdown is None:
+            markdown = self.report_generator.generate_report(report_data, 'markdown')
+        email_content = self.report_generator.markdown_to_text(markdown)
         
-        for fmt in ['markdown', 'html']:
-            report_file = self.data_dir / f"report_{timestamp}.{fmt}"
-            if report_file.exists():
-                attachments.append(str(report_file))
+        # 直接附上刚保存的报告文件，无需按时间戳重新查找
+        saved_files = saved_files or {}
+        attachments = [saved_files[fmt] for fmt in ('markdown', 'html') if fmt in saved_files]
         
         # 发送邮件通知
         if self.config['notifications']['email'].get('enabled', False):
@@ -411,13 +485,7 @@ class GitHubScheduler:
         
         # 每周报告
         weekly_time = schedule_config.get('weekly_report', 'MON:10:00')
-        day, time_part = weekly_time.split(':', 1)
-        # 映射星期几缩写到完整名称
-        day_mapping = {
-            'MON': 'monday', 'TUE': 'tuesday', 'WED': 'wednesday',
-            'THU': 'thursday', 'FRI': 'friday', 'SAT': 'saturday', 'SUN': 'sunday'
-        }
-        full_day = day_mapping.get(day.upper(), 'monday')
+        full_day, time_part = self._parse_weekly(weekly_time)
         getattr(schedule.every(), full_day).at(time_part).do(
             lambda: self.run_analysis(force_notification=True)
         )
@@ -428,6 +496,20 @@ class GitHubScheduler:
         schedule.every(interval_hours).hours.do(self.run_analysis)
         logger.info(f"已设置定期检查间隔: {interval_hours}小时")
     
+    @staticmethod
+    def _parse_weekly(spec: str) -> Tuple[str, str]:
+        """解析 'MON:10:00' 形式的每周报告时间，返回 (星期全称, 'HH:MM')，格式错误时回退到周一10:00"""
+        day, _, time_part = spec.partition(':')
+        full_day = WEEKDAY_NAMES.get(day.strip().upper())
+        try:
+            time_part = datetime.strptime(time_part.strip(), '%H:%M').strftime('%H:%M')
+        except ValueError:
+            full_day = None
+        if full_day is None:
+            logger.warning(f"每周报告时间格式无效: {spec}，使用默认值 MON:10:00")
+            return 'monday', '10:00'
+        return full_day, time_part
+    
     def run_scheduler(self):
         """运行调度器"""
         logger.info("GitHub仓库监控调度器启动")
@@ -444,61 +526,79 @@ class GitHubScheduler:
         try:
             while True:
                 schedule.run_pending()
-                time.sleep(60)  # 每分钟检查一次
+                # 直接睡到下一个任务的执行时间，不再每分钟轮询；
+                # 最长睡眠一小时，系统休眠或调整时钟后能及时校正
+                idle = schedule.idle_seconds()
+                time.sleep(MAX_IDLE_SECONDS if idle is None else min(max(idle, 0), MAX_IDLE_SECONDS))
         except KeyboardInterrupt:
             logger.info("调度器已停止")
     
+    def close(self):
+        """退出前关闭通知连接和GitHub会话"""
+        self.notification_service.close()
+        if self.monitor:
+            self.monitor.close()
+    
     def run_once(self, notification: bool = True):
         """运行一次分析"""
         return self.run_analysis(force_notification=notification)
 
 def main():
     """主函数"""
-    import argparse
-    
-    # 加载.env文件
+    # 加载.env文件，已存在的环境变量优先，不被文件中的值覆盖
     env_file = Path('.env')
     if env_file.exists():
-        with open(env_file) as f:
+        with open(env_file, encoding='utf-8') as f:
             for line in f:
                 line = line.strip()
-                if line and not line.startswith('#') and '=' in line:
-                    key, value = line.split('=', 1)
-                    os.environ[key.strip()] = value.strip()
+                if not line or line.startswith('#'):
+                    continue
+                key, sep, value = line.partition('=')
+                if sep:
+                    os.environ.setdefault(key.strip(), value.strip())
     
     parser = argparse.ArgumentParser(description='GitHub仓库监控调度器')
     parser.add_argument('--config', default='config.json', help='配置文件路径')
     parser.add_argument('--once', action='store_true', help='只运行一次分析')
     parser.add_argument('--deep', action='store_true', help='运行深度分析（包含 AI 能力和哲学洞察）')
     parser.add_argument('--no-notification', action='store_true', help='不发送通知')
+    parser.add_argument('--clear-cache', action='store_true', help='运行前清空GitHub API本地缓存')
     
     args = parser.parse_args()
     
     # 创建调度器
     scheduler = GitHubScheduler(args.config)
     
-    if args.once or args.deep:
-        # 运行一次
-        if args.deep:
-            print("开始深度分析（包含 AI 能力和哲学洞察）...")
-            report = scheduler.run_deep_analysis(force_notification=not args.no_notification)
-        else:
-            report = scheduler.run_once(notification=not args.no_notification)
-        
-        if report:
-            print("分析完成，报告已生成")
-            if args.deep and 'deep_analysis' in report:
-                deep = report['deep_analysis']
-                print("\n=== 深度分析摘要 ===")
-                print(f"AI 掌握程度: {deep.get('ai_profile', {}).get('overall_mastery', 'N/A')}")
-                print(f"AI 哲学: {deep.get('ai_profile', {}).get('ai_philosophy', 'N/A')}")
-                print(f"哲学宣言: {deep.get('philosophy', {}).get('philosophy_statement', 'N/A')}")
-                print(f"核心价值观: {', '.join(deep.get('philosophy', {}).get('core_values', []))}")
+    try:
+        if args.clear_cache and scheduler.monitor and scheduler.monitor.cache:
+            cleared = scheduler.monitor.cache.clear()
+            print(f"已清空缓存: {cleared} 条")
+    
+        if args.once or args.deep:
+            # 运行一次
+            if args.deep:
+                print("开始深度分析（包含 AI 能力和哲学洞察）...")
+                report = scheduler.run_deep_analysis(force_notification=not args.no_notification)
+            else:
+                report = scheduler.run_once(notification=not args.no_notification)
+        
+            if report:
+                print("分析完成，报告已生成")
+                if args.deep and 'deep_analysis' in report:
+                    deep = report['deep_analysis']
+                    print("\n=== 深度分析摘要 ===")
+                    print(f"AI 掌握程度: {deep.get('ai_profile', {}).get('overall_mastery', 'N/A')}")
+                    print(f"AI 哲学: {deep.get('ai_profile', {}).get('ai_philosophy', 'N/A')}")
+                    print(f"哲学宣言: {deep.get('philosophy', {}).get('philosophy_statement', 'N/A')}")
+                    print(f"核心价值观: {', '.join(deep.get('philosophy', {}).get('core_values', []))}")
+            else:
+                print("分析失败")
         else:
-            print("分析失败")
-    else:
-        # 运行调度器
-        scheduler.run_scheduler()
+            # 运行调度器
+            scheduler.run_scheduler()
+    finally:
+        # --once 和调度器退出时都发送 QUIT 关闭SMTP连接
+        scheduler.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file